@@ -1,10 +1,18 @@
 import streamlit as st
 import pandas as pd
-from pptx import Presentation
-from dispatcher import run_strips_template
+from dispatcher import get_layout_columns, iter_strips_template_to_file
+import hashlib
+from contextlib import closing
 import io
 import os
+import tempfile
 from path_helpers import get_base_path
+from helpers.key_pool import BrandfetchKeyPool
+from helpers.translation_cache import get_translation_cache
+from helpers.template_registry import TEMPLATE_FILES, load_template
+from helpers.buyers_input import INPUT_FORMATS, get_input_format, load_buyers_file
+from helpers.excel_loader import MASK_SHEET
+from helpers.run_report import RunReport
 
 # --- Soft password wall ---
 def check_auth():
@@ -33,6 +41,34 @@ def check_auth():
     st.stop()
 
 
+# Parsed uploads kept per server process: reruns and repeated generations of
+# the same file and sheet skip reading the file again
+UPLOAD_CACHE_ENTRIES = 8
+UPLOAD_CACHE_TTL = 60 * 60  # seconds
+
+
+@st.cache_data(max_entries=UPLOAD_CACHE_ENTRIES, ttl=UPLOAD_CACHE_TTL, show_spinner="Reading buyers file...")
+def load_buyers_upload(content_hash, input_format, sheet_name, columns, _file_bytes):
+    """
+    Parses an uploaded buyers file, cached on its content hash, format,
+    sheet name and projected columns.
+
+    The raw bytes are excluded from the cache key (leading underscore) so
+    Streamlit does not hash tens of MB again on every call.
+    """
+    return load_buyers_file(io.BytesIO(_file_bytes), columns=columns, input_format=input_format, sheet_name=sheet_name)
+
+
+@st.cache_resource
+def get_brandfetch_key_pool(keys):
+    """
+    Returns the Brandfetch key pool shared by every session of this server,
+    built once per set of keys, so cooldowns, disabled keys and usage
+    counts outlive reruns.
+    """
+    return BrandfetchKeyPool(dict(keys))
+
+
 st.set_page_config(layout="wide", page_title="Financial Buyers Presentation Tool")
 check_auth()
 
@@ -57,30 +93,48 @@ st.markdown("<hr style='border:1px solid #eee'>", unsafe_allow_html=True)
 # === Settings
 st.markdown("<h4 style='font-family:Arial; color:#003366;'>📂 Excel & PowerPoint Settings</h4>", unsafe_allow_html=True)
 
-# === API key selection ===
-api_choice = st.selectbox(
-    "Choose Brandfetch API key",
-    options=["Key 1", "Key 2", "Key 3"],
-    index=0
-)
+# === Brandfetch API keys ===
+# Every configured key is pooled; lookups are spread across them and fail over on rate limits
+def get_secret(name):
+    """Returns an app secret, or the environment variable of the same name when there is none."""
+    try:
+        if name in st.secrets:
+            return st.secrets[name]
+    except FileNotFoundError:  # no secrets file at all
+        pass
+    return os.environ.get(name, "")
+
 
 key_map = {
-    "Key 1": st.secrets["BRANDFETCH_API_KEY1"],
-    "Key 2": st.secrets["BRANDFETCH_API_KEY2"],
-    "Key 3": st.secrets["BRANDFETCH_API_KEY3"]
+    label: get_secret(secret_name)
+    for label, secret_name in [("Key 1", "BRANDFETCH_API_KEY1"), ("Key 2", "BRANDFETCH_API_KEY2"), ("Key 3", "BRANDFETCH_API_KEY3")]
 }
-brand_api_key = key_map[api_choice]
+key_map = {label: key for label, key in key_map.items() if key}
+if not key_map:
+    st.error("✘ No Brandfetch API key configured. Add BRANDFETCH_API_KEY1 (up to BRANDFETCH_API_KEY3) to the app secrets or the environment.")
+    st.stop()
+brand_api_key = get_brandfetch_key_pool(tuple(key_map.items()))
+st.caption(f"Using {len(key_map)} Brandfetch API keys, switching automatically when one hits its quota.")
 
 # Upload file
-uploaded_file = st.file_uploader("Upload your Excel file", type=["xlsx"])
-st.caption("Please ensure your Excel file maintains the 'Python Financials Mask' structure to guarantee accurate slide creation.")
-sheet_name = st.text_input("Sheet name", value="Python Financials Mask")
+uploaded_file = st.file_uploader(
+    "Upload your Excel file (or a Parquet/Arrow/CSV export of the buyers table)",
+    type=[extension.lstrip(".") for extension in INPUT_FORMATS]
+)
+st.caption("Please ensure your Excel file maintains the 'Python Financials Mask' structure to guarantee accurate slide creation. "
+           "Parquet, Arrow and CSV files must use the mask's column names (primary_type, dry_powder_latam, ...).")
+sheet_name = st.text_input("Sheet name", value=MASK_SHEET)
 template_file = st.selectbox(
     "Select PPT template file",
-    options=["financials_templates.pptx", "financials_templates_wide.pptx"],
+    options=list(TEMPLATE_FILES.values()),
     index=0  # defaults to first
 )
 output_file = st.text_input("Output PPT file name", value="buyers_presentation.pptx")
+force_logo_refresh = st.checkbox(
+    "Re-check logos Brandfetch could not find before",
+    value=False,
+    help="Domains without a Brandfetch logo are skipped for 30 days. Tick to ask Brandfetch again."
+)
 
 
 # Step 1 - Layout options
@@ -96,34 +150,97 @@ template_number = template_options[selected_template]
 
 st.markdown("<hr style='border:1px solid #eee'>", unsafe_allow_html=True)
 
+def show_run_report(report):
+    """Shows where the time of a run went, with its report as a JSON download."""
+    run = report.to_dict()
+    with st.expander(f"Run report ({run['total_seconds']:.1f}s)"):
+        st.dataframe(
+            pd.DataFrame.from_dict(run["stages"], orient="index").rename_axis("stage"),
+            use_container_width=True
+        )
+        st.caption("Stage times add up every call, so concurrent network stages can exceed the run time.")
+        st.json(run["counters"])
+        st.download_button(
+            label="Download run report (JSON)",
+            data=report.to_json(),
+            file_name="run_report.json",
+            mime="application/json"
+        )
+
+
+def cancel_generation():
+    st.session_state["generation_cancelled"] = True
+
+
 if uploaded_file is not None:
     # Just display filename for user confidence
     st.write(f"✓ Uploaded: {uploaded_file.name}")
+    if st.session_state.pop("generation_cancelled", False):
+        st.warning("✘ Generation cancelled.")
     
     
     # When button is pressed
     if st.button("Generate Presentation"):
         try:
-            df = pd.read_excel(
-                uploaded_file,
-                sheet_name=sheet_name,
-                header=1,
-                usecols="B:B, E:N, P:V, X:AD, AF:AK"
-            ).dropna(subset=['fund_name']).drop(columns=['fund_name'])
-            st.success(f"✓ Loaded {len(df)} buyers from uploaded file.")
-
-            prs = Presentation(os.path.join(get_base_path(), template_file))
-            run_strips_template(template_number, prs=prs, df=df, brand_api_key=brand_api_key)
-            pptx_io = io.BytesIO()
-            prs.save(pptx_io)
-            pptx_io.seek(0)
-            st.success("✓ Presentation generated successfully.")
-            st.download_button(
-                label="Download Presentation",
-                data=pptx_io,
-                file_name=output_file,
-                mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
-            )
+            report = RunReport()
+            with report.activate():
+                file_bytes = uploaded_file.getvalue()
+                input_format = get_input_format(uploaded_file.name)
+                # Columnar files are read for the chosen layout's columns only; a
+                # workbook is parsed whole anyway, so it stays cached for every layout
+                columns = None if input_format == "excel" else get_layout_columns(template_number)
+                df = load_buyers_upload(hashlib.sha256(file_bytes).hexdigest(), input_format, sheet_name, columns, file_bytes)
+                st.success(f"✓ Loaded {len(df)} buyers from uploaded file.")
+                if "ingest_seconds" in df.attrs:
+                    st.caption(f"Excel file read in {df.attrs['ingest_seconds']:.2f}s ({df.attrs['ingest_engine']}).")
+                if "memory_mb" in df.attrs:
+                    loaded_mb, compact_mb = df.attrs["memory_mb"]
+                    st.caption(f"Buyers table in memory: {compact_mb:.2f} MB (compacted from {loaded_mb:.2f} MB).")
+
+                prs = load_template(template_file)
+                translation_stats = get_translation_cache().stats()
+                # Slides are streamed to a file as they are built, so the whole deck is
+                # never held in memory as python-pptx objects. The download button still
+                # reads the finished .pptx into Streamlit's media store: one in-memory
+                # copy of the compressed file per generation
+                with tempfile.TemporaryDirectory(prefix="buyers_deck_") as output_dir:
+                    output_path = os.path.join(output_dir, "presentation.pptx")
+                    progress_bar = st.progress(0.0, text="Starting...")
+                    network_status = st.empty()
+                    # Clicking reruns the page, which interrupts this loop; closing
+                    # the generator then cancels the run and its pending network calls
+                    st.button("Cancel generation", on_click=cancel_generation)
+                    with closing(iter_strips_template_to_file(
+                        template_number, prs=prs, df=df, brand_api_key=brand_api_key, output_file=output_path,
+                        force_logo_refresh=force_logo_refresh
+                    )) as events:
+                        for event in events:
+                            if event.stage in ("logos", "translations"):
+                                network_status.caption(event.message)
+                            else:
+                                progress_bar.progress(event.fraction, text=event.message)
+                    network_status.empty()
+                    st.success("✓ Presentation generated successfully.")
+                    st.caption("Brandfetch usage: " + ", ".join(
+                        f"{usage['label']}: {usage['requests']} lookups"
+                        + (f" ({usage['rate_limited']} rate limited)" if usage["rate_limited"] else "")
+                        + (" (disabled)" if usage["disabled"] else "")
+                        for usage in brand_api_key.usage()
+                    ))
+                    if template_number in (3, 4):
+                        new_stats = get_translation_cache().stats()
+                        st.caption(
+                            f"Translations: {new_stats['hits'] - translation_stats['hits']} from cache, "
+                            f"{new_stats['misses'] - translation_stats['misses']} translated online."
+                        )
+                    with open(output_path, "rb") as pptx_file:
+                        st.download_button(
+                            label="Download Presentation",
+                            data=pptx_file,
+                            file_name=output_file,
+                            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
+                        )
+            show_run_report(report)
         except Exception as e:
             st.error(f"✘ Something went wrong: {e}")
 else:
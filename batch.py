@@ -0,0 +1,242 @@
+"""
+Headless batch generation of buyers decks from a manifest.
+
+    python batch.py manifest.json [--workers N] [--force-logo-refresh]
+
+The manifest is a JSON list of jobs (or an object with a "jobs" list):
+
+    [
+        {"input": "data/healthcare.xlsx", "sheet": "Python Financials Mask",
+         "template_file": "financials_templates.pptx", "layout": 2,
+         "language": "pt", "output": "out/healthcare_pt.pptx"},
+        {"input": "data/fintech.parquet", "layout": 1, "output": "out/fintech.pptx"}
+    ]
+
+`input` may be any file `load_buyers_file` reads; `sheet` (Excel only),
+`template_file` (default 'financials_templates.pptx'), `layout` (1: Dry
+Powder only, 2: Dry Powder + AUM; default 1) and `language` ('en' or 'pt',
+default 'en') are optional. Relative paths are relative to the manifest.
+Brandfetch keys are read from the BRANDFETCH_API_KEY1..3 environment
+variables.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dispatcher import get_layout_columns, run_strips_template_to_file
+from helpers.buyers_input import get_input_format, load_buyers_file
+from helpers.excel_loader import MASK_SHEET
+from helpers.key_pool import BrandfetchKeyPool
+from helpers.logo_resources import prefetch_logos
+from helpers.template_registry import TEMPLATE_FILES, load_template
+from translate_helpers import build_translation_table
+
+# (layout, language) -> template number of `run_strips_template`
+TEMPLATE_NUMBERS = {
+    (1, "en"): 1,
+    (2, "en"): 2,
+    (1, "pt"): 3,
+    (2, "pt"): 4,
+}
+
+BRANDFETCH_KEY_VARIABLES = ["BRANDFETCH_API_KEY1", "BRANDFETCH_API_KEY2", "BRANDFETCH_API_KEY3"]
+
+
+class BatchJob:
+    """
+    One deck to generate, as described by a manifest entry.
+
+    Raises
+    ------
+    ValueError
+        If the entry lacks `input` or `output`, or names an unknown layout or language.
+    """
+
+    def __init__(self, entry, base_dir):
+        missing = [field for field in ("input", "output") if field not in entry]
+        if missing:
+            raise ValueError(f"Manifest job {entry} is missing: {', '.join(missing)}")
+        layout = int(entry.get("layout", 1))
+        language = entry.get("language", "en").lower()
+        if (layout, language) not in TEMPLATE_NUMBERS:
+            raise ValueError(f"Unknown layout {layout} / language '{language}' in manifest job {entry}")
+
+        self.input = os.path.join(base_dir, entry["input"])
+        self.sheet = entry.get("sheet", MASK_SHEET)
+        self.template_file = entry.get("template_file", TEMPLATE_FILES["standard"])
+        self.template_number = TEMPLATE_NUMBERS[(layout, language)]
+        self.language = language
+        self.output = os.path.join(base_dir, entry["output"])
+
+    @property
+    def columns(self):
+        """Columns to load for the job: its layout's, except from workbooks, which are read whole."""
+        if get_input_format(self.input) == "excel":
+            return None
+        return get_layout_columns(self.template_number)
+
+    @property
+    def source(self):
+        """Key of the job's buyers data: jobs reading the same sheet load it once."""
+        return (self.input, self.sheet)
+
+
+def read_manifest(manifest_file):
+    """Returns the BatchJobs of a manifest file."""
+    with open(manifest_file, encoding="utf-8") as f:
+        manifest = json.load(f)
+    entries = manifest["jobs"] if isinstance(manifest, dict) else manifest
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    return [BatchJob(entry, base_dir) for entry in entries]
+
+
+def load_job_input(input_file, sheet, columns):
+    """Loads one buyers file in a worker process."""
+    return load_buyers_file(input_file, columns=columns, sheet_name=sheet)
+
+
+def resolve_resources(df, brand_api_key, languages=(), force_logo_refresh=False):
+    """
+    Fetches the logos and translations of a buyers DataFrame into the
+    shared logo folders and caches, so decks rendered from it need no
+    network calls.
+
+    Returns the logo files, as `prefetch_logos`, for `generate_deck`.
+    """
+    logo_files = prefetch_logos(df, brand_api_key, force_refresh=force_logo_refresh)
+    for language in languages:
+        build_translation_table(df, target_lang=language)
+    return logo_files
+
+
+def generate_deck(job, df, brand_api_key, force_logo_refresh, logo_files=None):
+    """
+    Generates one deck in a worker process; returns (slides written, seconds).
+
+    With the `logo_files` of `resolve_resources`, no logo is looked up again.
+    """
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(job.output) or ".", exist_ok=True)
+    prs = load_template(job.template_file)
+    slides = run_strips_template_to_file(
+        job.template_number, prs, df, brand_api_key, job.output, force_logo_refresh=force_logo_refresh,
+        logo_files=logo_files
+    )
+    return slides, time.perf_counter() - start
+
+
+def run_batch(jobs, brand_api_key, workers=None, force_logo_refresh=False):
+    """
+    Generates every deck of a batch on a pool of processes.
+
+    Each distinct input is loaded once, by a worker. Logos and translations
+    of every job are then resolved up front in this process, into the logo
+    folders and the persistent translation and negative logo caches that
+    every worker reads, so a logo or string shared by several decks is
+    fetched once. Finally the workers render the decks, each streamed to
+    its output file (see `run_strips_template_to_file`).
+
+    A failing job is reported and does not stop the others.
+
+    Parameters
+    ----------
+    jobs : list of BatchJob
+
+    brand_api_key : BrandfetchKeyPool
+        Shared by the whole batch.
+
+    workers : int, optional
+        Number of worker processes; defaults to the number of CPUs.
+
+    force_logo_refresh : bool
+        Re-check logos Brandfetch could not find before.
+
+    Returns
+    -------
+    dict
+        Mapping of each job's output path to (slides written, seconds), or
+        to the exception that made it fail.
+    """
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+    results = {}
+
+    # Columnar inputs are read for the columns of every layout using them
+    source_columns = {}
+    for job in jobs:
+        if job.columns is None:
+            source_columns[job.source] = None
+            continue
+        columns = source_columns.setdefault(job.source, [])
+        columns.extend(column for column in job.columns if column not in columns)
+
+    # Spawned rather than forked, like the sharded deck builder
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        print(f"📥 Loading {len(source_columns)} buyers files on {workers} workers...")
+        loads = {
+            source: executor.submit(load_job_input, source[0], source[1], columns)
+            for source, columns in source_columns.items()
+        }
+        frames = {}
+        for source, future in loads.items():
+            try:
+                frames[source] = future.result()
+            except Exception as e:
+                print(f"❌ Could not load {source[0]}: {e}")
+                frames[source] = e
+
+        print("🔍 Resolving logos and translations for the whole batch...")
+        languages = {}
+        for job in jobs:
+            if job.language != "en":
+                languages.setdefault(job.source, set()).add(job.language)
+        logo_files = {}
+        for source, df in frames.items():
+            if isinstance(df, Exception):
+                continue
+            logo_files[source] = resolve_resources(df, brand_api_key, languages.get(source, ()), force_logo_refresh)
+
+        runs = {}
+        for job in jobs:
+            df = frames[job.source]
+            if isinstance(df, Exception):
+                results[job.output] = df
+                continue
+            runs[job.output] = executor.submit(
+                generate_deck, job, df, brand_api_key, force_logo_refresh, logo_files[job.source]
+            )
+        for output, future in runs.items():
+            try:
+                results[output] = future.result()
+                print(f"✅ {output}: {results[output][0]} slides in {results[output][1]:.1f}s")
+            except Exception as e:
+                print(f"❌ {output}: {e}")
+                results[output] = e
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate buyers decks in batch from a JSON manifest.")
+    parser.add_argument("manifest", help="JSON manifest of the decks to generate")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: number of CPUs)")
+    parser.add_argument("--force-logo-refresh", action="store_true",
+                        help="re-check logos Brandfetch could not find before")
+    args = parser.parse_args(argv)
+
+    jobs = read_manifest(args.manifest)
+    brand_api_key = BrandfetchKeyPool({name: os.environ.get(name, "") for name in BRANDFETCH_KEY_VARIABLES})
+
+    start = time.perf_counter()
+    results = run_batch(jobs, brand_api_key, workers=args.workers, force_logo_refresh=args.force_logo_refresh)
+    failed = [output for output, result in results.items() if isinstance(result, Exception)]
+    print(f"🏁 {len(results) - len(failed)} of {len(results)} decks generated in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Benchmarks table cell writing: the generic paragraph-scanning writer against
+the compiled slot writer, for every template table of both template files.
+
+Runs offline on synthetic buyers and draws no logos, so only table copying
+and cell writing are timed.
+
+    python benchmarks/bench_cell_writer.py [--slides 200]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+from pptx import Presentation
+from helpers.cell_writer import CompiledTableWriter, write_cell_mark, write_cell_text
+from helpers.copy_helpers import copy_table_from_template_slide
+from helpers.strip_renderer import BR_PRESENCE_MARKS
+from helpers.template_tables import get_template_table
+from path_helpers import get_base_path
+
+TEMPLATE_FILES = ["financials_templates.pptx", "financials_templates_wide.pptx"]
+TEMPLATE_SLIDES = {1: "EN DP", 2: "EN DP+AUM", 3: "PT DP", 4: "PT DP+AUM"}
+ROWS_PER_SLIDE = 5
+
+
+def _row_texts(number):
+    return [
+        str(number), "Brazil", "Private Equity\nVenture Capital", "DP:1,234.50\nAUM:98,765.43",
+        "Yes" if number % 2 else "No", "Healthcare services", "Fintech platform", "Logistics software",
+    ]
+
+
+def _fill_generic(table_shape, start_number):
+    table = table_shape.table
+    for i in range(ROWS_PER_SLIDE):
+        texts = _row_texts(start_number + i)
+        for col_idx, text in enumerate(texts):
+            cell = table.cell(i + 1, col_idx)
+            if col_idx == 4:
+                write_cell_mark(cell, *BR_PRESENCE_MARKS[text])
+            else:
+                write_cell_text(cell, text, remove_trailing=col_idx != 0)
+
+
+def _fill_compiled(table_shape, start_number, slots):
+    writer = CompiledTableWriter(table_shape, slots)
+    for i in range(ROWS_PER_SLIDE):
+        texts = _row_texts(start_number + i)
+        for col_idx, text in enumerate(texts):
+            if col_idx == 4:
+                writer.write_mark(i + 1, col_idx, *BR_PRESENCE_MARKS[text])
+            else:
+                writer.write_text(i + 1, col_idx, text, remove_trailing=col_idx != 0)
+
+
+def _time_fill(template_file, source_slide_idx, slides, compiled):
+    prs = Presentation(os.path.join(get_base_path(), template_file))
+    template_table = get_template_table(prs, source_slide_idx)
+    layout = prs.slide_layouts[0]
+    elapsed = 0.0
+    for n in range(slides):
+        slide = prs.slides.add_slide(layout)
+        table_shape = copy_table_from_template_slide(prs, source_slide_idx=source_slide_idx, target_slide=slide)
+        # Like timeit, keep garbage collection pauses out of the measurement
+        gc.disable()
+        start = time.perf_counter()
+        if compiled:
+            _fill_compiled(table_shape, n * ROWS_PER_SLIDE + 1, template_table.slots)
+        else:
+            _fill_generic(table_shape, n * ROWS_PER_SLIDE + 1)
+        elapsed += time.perf_counter() - start
+        gc.enable()
+    return elapsed / slides * 1000, [etree.tostring(shape.element) for shape in prs.slides[-1].shapes if shape.has_table]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--slides", type=int, default=200, help="slides filled per template table")
+    args = parser.parse_args()
+
+    print(f"{'template':<34}{'table':<12}{'generic ms':>12}{'compiled ms':>13}{'speedup':>9}")
+    for template_file in TEMPLATE_FILES:
+        for source_slide_idx, label in TEMPLATE_SLIDES.items():
+            generic_ms, generic_xml = _time_fill(template_file, source_slide_idx, args.slides, compiled=False)
+            compiled_ms, compiled_xml = _time_fill(template_file, source_slide_idx, args.slides, compiled=True)
+            if generic_xml != compiled_xml:
+                sys.exit(f"❌ {template_file} slide {source_slide_idx}: compiled writer output differs")
+            print(f"{template_file:<34}{label:<12}{generic_ms:>12.3f}{compiled_ms:>13.3f}{generic_ms / compiled_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Benchmarks whole deck generation: every layout of `run_strips_template`
+against both template files, for synthetic buyers tables of several sizes.
+
+Runs offline: Brandfetch lookups and translations go to stub providers
+(with an optional simulated latency), and each case uses empty caches of
+its own, so every run does the same work. Normalized logos are built in
+the case's temporary folder before timing starts, like the warm cache of
+a deployed app, and nothing is written to the repository's logo folders.
+Each case runs in a fresh process, so its peak memory is its own.
+
+Records slides per second, per-slide latency percentiles, peak memory,
+output file size and the stage timings of the run report, and saves them
+to JSON; pass an earlier results file to --compare to see the change.
+
+    python benchmarks/bench_decks.py [--buyers 10 100 1000] [--latency-ms 0]
+        [--output bench_decks.json] [--compare before.json]
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from path_helpers import get_base_path
+
+TEMPLATE_FILES = ["financials_templates.pptx", "financials_templates_wide.pptx"]
+LAYOUTS = {1: "EN DP", 2: "EN DP+AUM", 3: "PT DP", 4: "PT DP+AUM"}
+DEFAULT_BUYERS = [10, 100, 1000]
+LATENCY_PERCENTILES = [50, 90, 95, 99]
+
+COUNTRIES = ["Brazil", "United States", "United Kingdom", "Mexico", "Chile", "Colombia", "Spain", None]
+BUYER_TYPES = ["PE/Buyout", "Venture Capital", "Growth", "Family Office", "Corporate", "Infrastructure"]
+SHORT_DESCRIPTIONS = [
+    "Healthcare services", "Fintech platform", "Logistics software", "Specialty retail",
+    "Agribusiness", "Education technology", "Renewable energy", "Industrial automation",
+]
+
+
+def make_buyers(buyers, missing_logos=0.05, seed=0):
+    """
+    Returns a synthetic buyers table with the columns of the financials mask.
+
+    Logos are drawn from the bundled logos folder, except for a share
+    `missing_logos` of names that are not on disk and go to Brandfetch.
+    Descriptions repeat across buyers, like in real workbooks, and amounts
+    mix numbers, blanks and 'n/a'.
+    """
+
+    rnd = random.Random(seed)
+    logos = sorted(name[:-4] for name in os.listdir(os.path.join(get_base_path(), "logos")) if name.endswith(".png"))
+
+    def logo():
+        if rnd.random() < missing_logos:
+            name = f"bench_missing_{rnd.randrange(buyers)}"
+            return name, f"{name}.example.com"
+        name = rnd.choice(logos)
+        return name, f"{name}.com"
+
+    rows = []
+    for i in range(buyers):
+        logo_file, website = logo()
+        row = {
+            "country": rnd.choice(COUNTRIES),
+            "primary_type": rnd.choice(BUYER_TYPES),
+            "secondary_type": rnd.choice(BUYER_TYPES + [None]),
+            "dry_powder_latam": rnd.choice([round(rnd.uniform(1, 50000), 2), None, "n/a"]),
+            "aum_latam": rnd.choice([round(rnd.uniform(100, 500000), 2), None]),
+            "brazil_investments": rnd.choice(["Yes", "No", None]),
+            "linc_advised": rnd.choice(["Yes", "No", "No", "No"]),
+            "logo_file": logo_file,
+            "website": website,
+        }
+        for k in (1, 2, 3):
+            row[f"investment{k}_shortdesc"] = rnd.choice(SHORT_DESCRIPTIONS + [f"Portfolio company {i % 50}", None])
+            row[f"investment{k}_logofile"], row[f"investment{k}_website"] = logo()
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+class _StubTranslator:
+    """Stands in for GoogleTranslator: marks the text as translated after `latency` seconds."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def translate(self, text):
+        time.sleep(self.latency)
+        return f"[pt] {text}"
+
+
+def _install_stub_providers(cache_dir, latency):
+    # Empty caches of this case only, and no network: Brandfetch answers every
+    # missing logo with a definitive miss, translations come from the stub
+    import helpers.logo_resources as logo_resources
+    import translate_helpers
+    from helpers import logo_normalize, negative_cache, translation_cache
+
+    # An absolute folder replaces the one kept next to the original logos
+    logo_normalize.NORMALIZED_DIR = os.path.join(cache_dir, "normalized_logos")
+    translation_cache._default_cache = translation_cache.TranslationCache(os.path.join(cache_dir, "translations.sqlite"))
+    negative_cache._default_cache = negative_cache.NegativeLogoCache(os.path.join(cache_dir, "negative_logos.sqlite3"))
+
+    def lookup_brandfetch_logo(domain, BRANDFETCH_API_KEY, cancel_event=None):
+        time.sleep(latency)
+        return None, True
+
+    translator = _StubTranslator(latency)
+    logo_resources.lookup_brandfetch_logo = lookup_brandfetch_logo
+    translate_helpers.get_translator = lambda target_lang="pt", source_lang="en": translator
+
+
+def _warm_normalized_logos(df):
+    # Builds the normalized variant of every logo the deck draws, untimed
+    from helpers.logo_normalize import normalized_logo_path
+    from helpers.logo_resources import collect_logo_requests, find_local_logo
+
+    for logo_name in collect_logo_requests(df):
+        logo_file = find_local_logo(logo_name)
+        if logo_file:
+            normalized_logo_path(logo_file)
+    lincoln_file = find_local_logo("linc_favi", "linc_logos")
+    if lincoln_file:
+        normalized_logo_path(lincoln_file)
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(template_file, template_number, buyers, latency, missing_logos):
+    """Generates one deck in this process and returns its measurements."""
+    from pptx import Presentation
+    from dispatcher import run_strips_template
+    from helpers.buyers_frame import compact_buyers_frame
+    from helpers.progress import RunControl
+    from helpers.run_report import RunReport
+
+    with tempfile.TemporaryDirectory(prefix="bench_decks_") as work_dir:
+        _install_stub_providers(work_dir, latency)
+        # Like the app, the deck is built from the compacted table
+        df = compact_buyers_frame(make_buyers(buyers, missing_logos))
+        _warm_normalized_logos(df)
+        prs = Presentation(os.path.join(get_base_path(), template_file))
+        rss_before = _peak_rss_mb()
+
+        slide_times = []
+        control = RunControl(on_progress=lambda event: slide_times.append(time.perf_counter()) if event.stage == "slides" else None)
+        report = RunReport()
+        output_file = os.path.join(work_dir, "deck.pptx")
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), report.activate():
+            start = time.perf_counter()
+            run_strips_template(template_number, prs=prs, df=df, brand_api_key="bench", control=control)
+            rendered = time.perf_counter()
+            prs.save(output_file)
+            saved = time.perf_counter()
+
+        latencies = np.diff([start] + slide_times) * 1000
+        run = report.to_dict()
+        return {
+            "template_file": template_file,
+            "template_number": template_number,
+            "layout": LAYOUTS[template_number],
+            "buyers": buyers,
+            "slides": len(slide_times),
+            "render_seconds": round(rendered - start, 4),
+            "save_seconds": round(saved - rendered, 4),
+            "slides_per_second": round(len(slide_times) / (saved - start), 2),
+            "slide_latency_ms": {
+                **{f"p{pct}": round(float(np.percentile(latencies, pct)), 2) for pct in LATENCY_PERCENTILES},
+                "max": round(float(latencies.max()), 2),
+            },
+            "peak_rss_mb": round(_peak_rss_mb(), 1) if rss_before is not None else None,
+            "rss_before_run_mb": round(rss_before, 1) if rss_before is not None else None,
+            "file_size_mb": round(os.path.getsize(output_file) / 1024 ** 2, 3),
+            "stages": run["stages"],
+            "counters": run["counters"],
+        }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=get_base_path(), capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _case_key(result):
+    return result["template_file"], result["template_number"], result["buyers"]
+
+
+def print_comparison(results, baseline_file):
+    """Prints the change of each case against the same case in an earlier results file."""
+    with open(baseline_file, encoding="utf-8") as f:
+        baseline = {_case_key(result): result for result in json.load(f)["results"]}
+
+    print(f"\nCompared with {baseline_file}:")
+    print(f"{'template':<34}{'layout':<12}{'buyers':>7}{'slides/s':>18}{'p95 ms':>18}{'peak MB':>16}")
+    for result in results:
+        before = baseline.get(_case_key(result))
+        if before is None:
+            continue
+        print(
+            f"{result['template_file']:<34}{result['layout']:<12}{result['buyers']:>7}"
+            f"{before['slides_per_second']:>9.1f} → {result['slides_per_second']:<6.1f}"
+            f"{before['slide_latency_ms']['p95']:>9.1f} → {result['slide_latency_ms']['p95']:<6.1f}"
+            f"{before['peak_rss_mb'] or 0:>8.0f} → {result['peak_rss_mb'] or 0:<5.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--buyers", type=int, nargs="+", default=DEFAULT_BUYERS, help="buyers table sizes to run")
+    parser.add_argument("--layouts", type=int, nargs="+", default=list(LAYOUTS), choices=list(LAYOUTS),
+                        help="template numbers to run")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated latency of each Brandfetch lookup and translation")
+    parser.add_argument("--missing-logos", type=float, default=0.05, help="share of logos not on disk")
+    parser.add_argument("--output", default="bench_decks.json", help="JSON file the results are saved to")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'template':<34}{'layout':<12}{'buyers':>7}{'slides':>8}{'slides/s':>10}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'peak MB':>9}{'size MB':>9}")
+    for template_file in TEMPLATE_FILES:
+        for template_number in args.layouts:
+            for buyers in args.buyers:
+                # A fresh process per case, so peak memory and caches start clean
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    result = executor.submit(
+                        run_case, template_file, template_number, buyers, args.latency_ms / 1000, args.missing_logos
+                    ).result()
+                results.append(result)
+                print(
+                    f"{template_file:<34}{result['layout']:<12}{buyers:>7}{result['slides']:>8}"
+                    f"{result['slides_per_second']:>10.1f}{result['slide_latency_ms']['p50']:>9.1f}"
+                    f"{result['slide_latency_ms']['p95']:>9.1f}{result['peak_rss_mb'] or 0:>9.0f}{result['file_size_mb']:>9.2f}"
+                )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": time.time(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "latency_ms": args.latency_ms,
+            "missing_logos": args.missing_logos,
+            "results": results,
+        }, f, indent=2)
+    print(f"💾 Saved results to {args.output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
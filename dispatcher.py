@@ -1,111 +1,357 @@
+import gc
+import io
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 from pptx import Presentation
-from template_1 import financials_layout_one
-from template_2 import financials_layout_two
-from template_1_PT import financials_layout_one_PT
-from template_2_PT import financials_layout_two_PT
+from template_1 import financials_layout_one, LAYOUT as LAYOUT_1
+from template_2 import financials_layout_two, LAYOUT as LAYOUT_2
+from template_1_PT import financials_layout_one_PT, LAYOUT as LAYOUT_1_PT
+from template_2_PT import financials_layout_two_PT, LAYOUT as LAYOUT_2_PT
 from path_helpers import get_base_path
+from helpers.buyers_frame import prepare_buyers_frame
+from helpers.deck_merge import merge_slides
+from helpers.io_pipeline import run_pipeline
+from helpers.logo_placement import ImagePartCache
+from helpers.logo_resources import prefetch_logos
+from helpers.progress import RunCancelled, RunControl, iter_progress
+from helpers.run_report import count, span
+from helpers.streaming_writer import StreamingDeckWriter
+from helpers.template_tables import get_registered_template_file, register_template_file
+from translate_helpers import build_translation_table
 
 BASE_PATH = get_base_path()
 
 
-prs = Presentation(os.path.join(BASE_PATH, "financials_templates.pptx"))
+# template_number -> (slide builder, slide layout index, translation language)
+STRIP_LAYOUTS = {
+    1: (financials_layout_one, 1, None),
+    2: (financials_layout_two, 1, None),
+    3: (financials_layout_one_PT, 2, "pt"),
+    4: (financials_layout_two_PT, 2, "pt"),
+}
 
-for i, layout in enumerate(prs.slide_layouts):
-    print(f"Layout {i}: {layout.name}")
+# template_number -> StripLayout the slide builder renders
+STRIP_LAYOUT_DEFINITIONS = {
+    1: LAYOUT_1,
+    2: LAYOUT_2,
+    3: LAYOUT_1_PT,
+    4: LAYOUT_2_PT,
+}
 
+ROWS_PER_SLIDE = 5
 
+# Slides rendered in memory at a time when streaming a deck to a file
+STREAM_BATCH_SLIDES = 50
 
 
-def run_strips_template(template_number: int, prs: Presentation, df: pd.DataFrame, brand_api_key):
+def get_layout_columns(template_number: int) -> list:
+    """
+    Returns the buyers data columns a strip template reads, to load only
+    those from columnar inputs (see `load_buyers_file`).
+    """
+    return STRIP_LAYOUT_DEFINITIONS[template_number].source_columns()
+
+
+def run_strips_template(template_number: int, prs: Presentation, df: pd.DataFrame, brand_api_key,
+                        force_logo_refresh: bool = False, concurrency: dict = None,
+                        start_number: int = 1, workers: int = 1, control: RunControl = None, logo_files: dict = None):
     """
     Wrapper function to select the template and populate the presentation
     with all slides needed, slicing the DataFrame into chunks automatically.
 
+    Network I/O (Brandfetch lookups, logo downloads, translations) runs on an
+    asyncio pipeline: the resources of upcoming chunks are fetched while the
+    current chunk is being rendered.
+
     Parameters
     ----------
     template_number : int
         The name of the template to deploy. Examples might include:
-        - 1: The primary buyers strip layout with standard table format.
-        - 2: (future) An alternative layout.
+        - 1: Buyers strip with Dry Powder only.
+        - 2: Buyers strip with Dry Powder + AUM.
+        - 3: Same as 1, translated to Portuguese.
+        - 4: Same as 2, translated to Portuguese.
 
     prs : pptx.Presentation
         The loaded PowerPoint Presentation object where slides will be added.
 
     df : pandas.DataFrame
         The full DataFrame of buyers data. This function will handle
-        slicing it into chunks (6 rows per slide).
+        slicing it into chunks (5 rows per slide).
+
+    brand_api_key : str or BrandfetchKeyPool
+        Brandfetch key (or pool of keys) used to fetch missing logos.
+
+    force_logo_refresh : bool
+        Ask Brandfetch again for domains cached as having no logo.
+
+    concurrency : dict, optional
+        Maximum concurrent calls per upstream, e.g. {'brandfetch': 4, 'translate': 8}.
+
+    start_number : int
+        Number shown for the first buyer of `df`.
+
+    workers : int
+        Number of processes building slides. Above 1, the deck is built in
+        shards (see `run_strips_template_sharded`).
+
+    control : RunControl, optional
+        Receives 'logos', 'translations' and 'slides' progress, and stops
+        the run when cancelled (see `iter_strips_template_to_file`).
+
+    logo_files : dict, optional
+        Logos already resolved, as returned by `prefetch_logos`; they are
+        not looked up again. Slides are only ever drawn with logos resolved
+        by then: rendering itself makes no network call.
 
     Raises
     ------
     ValueError
         If an unknown template number is provided.
 
+    RunCancelled
+        If `control` is cancelled during the run.
+
     Examples
     --------
-    >>> run_strips_template(template_number=1, prs=prs, df=df)
-    This would add a slide using layout_one to the existing presentation `prs`
-    and populate it with the data from `chunk_df`.
+    >>> run_strips_template(template_number=1, prs=prs, df=df, brand_api_key=key)
+    This would add one slide per 5 buyers using layout_one to the existing
+    presentation `prs` and populate them with the data from `df`.
     """
 
-    if template_number == 1:
-        rows_per_slide = 5
-        runs_total = (len(df) + rows_per_slide - 1) // rows_per_slide # Add an extra to force floor division to work like ceiling division, so last partial slide is included
+    if template_number not in STRIP_LAYOUTS:
+        raise ValueError(f"Unknown template number: {template_number}")
+    build_slide, layout_index, target_lang = STRIP_LAYOUTS[template_number]
 
-        for run_count in range(runs_total):
-            print(f"📊 Creating slide {run_count + 1} of {runs_total}...")
-            start_idx = run_count * rows_per_slide
-            chunk_df = df.iloc[start_idx : start_idx + rows_per_slide]
-            start_number = run_count * rows_per_slide + 1
+    if workers > 1 and len(df) > ROWS_PER_SLIDE:
+        run_strips_template_sharded(
+            template_number, prs, df, brand_api_key, workers=workers,
+            force_logo_refresh=force_logo_refresh, concurrency=concurrency, start_number=start_number, control=control,
+            logo_files=logo_files
+        )
+        return
 
-            financials_layout_one(
-                prs, layout_index=1, buyers_chunk_df=chunk_df, start_number=start_number, brand_api_key=brand_api_key
-            )
-        print(f"✅ Finished presentation with {runs_total} slides.")
-    elif template_number == 2:
-        rows_per_slide = 5
-        runs_total = (len(df) + rows_per_slide - 1) // rows_per_slide # Add an extra to force floor division to work like ceiling division, so last partial slide is included
-
-        for run_count in range(runs_total):
-            print(f"📊 Creating slide {run_count + 1} of {runs_total}...")
-            start_idx = run_count * rows_per_slide
-            chunk_df = df.iloc[start_idx : start_idx + rows_per_slide]
-            start_number = run_count * rows_per_slide + 1
-
-            financials_layout_two(
-                prs, layout_index=1, buyers_chunk_df=chunk_df, start_number=start_number, brand_api_key=brand_api_key
-            )
-        print(f"✅ Finished presentation with {runs_total} slides.")
-    elif template_number == 3:
-        rows_per_slide = 5
-        runs_total = (len(df) + rows_per_slide - 1) // rows_per_slide # Add an extra to force floor division to work like ceiling division, so last partial slide is included
-
-        for run_count in range(runs_total):
-            print(f"📊 Creating slide {run_count+1} of {runs_total}...")
-            start_idx = run_count * rows_per_slide
-            chunk_df = df.iloc[start_idx : start_idx + rows_per_slide]
-            start_number = run_count * rows_per_slide + 1
-
-            financials_layout_one_PT(
-                prs, layout_index=2, buyers_chunk_df=chunk_df, start_number=start_number, brand_api_key=brand_api_key
-            )
-        print(f"✅ Finished presentation with {runs_total} slides.")
-    elif template_number == 4:
-        rows_per_slide = 5
-        runs_total = (len(df) + rows_per_slide - 1) // rows_per_slide # Add an extra to force floor division to work like ceiling division, so last partial slide is included
-
-        for run_count in range(runs_total):
-            print(f"📊 Creating slide {run_count+1} of {runs_total}...")
-            start_idx = run_count * rows_per_slide
-            chunk_df = df.iloc[start_idx : start_idx + rows_per_slide]
-            start_number = run_count * rows_per_slide + 1
-
-            financials_layout_two_PT(
-                prs, layout_index=2, buyers_chunk_df=chunk_df, start_number=start_number, brand_api_key=brand_api_key
+    control = control or RunControl()
+
+    # Display strings, type labels and flags are computed for all buyers at once
+    with span("prepare"):
+        df = prepare_buyers_frame(df)
+
+    runs_total = (len(df) + ROWS_PER_SLIDE - 1) // ROWS_PER_SLIDE # Add an extra to force floor division to work like ceiling division, so last partial slide is included
+    chunks = [
+        (df.iloc[start_idx : start_idx + ROWS_PER_SLIDE], start_number + start_idx)
+        for start_idx in range(0, len(df), ROWS_PER_SLIDE)
+    ]
+
+    # Each logo file is read, hashed and added to the package once per run
+    image_cache = ImagePartCache(prs)
+
+    def render_chunk(chunk_df, chunk_start, translations, chunk_logo_files):
+        slide_number = (chunk_start - start_number) // ROWS_PER_SLIDE + 1
+        print(f"📊 Creating slide {slide_number} of {runs_total}...")
+        extra = {"translations": translations} if target_lang else {}
+        build_slide(
+            prs, layout_index=layout_index, buyers_chunk_df=chunk_df, start_number=chunk_start,
+            brand_api_key=brand_api_key, image_cache=image_cache, logo_files=chunk_logo_files, **extra
+        )
+        control.report("slides", slide_number, runs_total, f"Creating slide {slide_number} of {runs_total}")
+
+    run_pipeline(
+        df, chunks, render_chunk, brand_api_key=brand_api_key, target_lang=target_lang,
+        concurrency=concurrency, force_logo_refresh=force_logo_refresh, control=control, logo_files=logo_files
+    )
+    print(f"✅ Finished presentation with {runs_total} slides.")
+    print(f"🖼️ Logo images: {image_cache.misses} loaded, {image_cache.hits} reused.")
+    count("logo_images_loaded", image_cache.misses)
+    count("logo_images_reused", image_cache.hits)
+
+
+def _build_shard(template_blob, template_file, template_number, shard_df, brand_api_key, concurrency, start_number,
+                 logo_files):
+    """Builds one shard of a deck in a worker process; returns the saved shard deck."""
+    prs = Presentation(io.BytesIO(template_blob))
+    if template_file is not None:
+        register_template_file(prs, template_file)
+    run_strips_template(template_number, prs, shard_df, brand_api_key, concurrency=concurrency, start_number=start_number,
+                        logo_files=logo_files)
+    shard_io = io.BytesIO()
+    prs.save(shard_io)
+    return shard_io.getvalue()
+
+
+def run_strips_template_sharded(template_number: int, prs: Presentation, df: pd.DataFrame, brand_api_key,
+                                workers: int = None, force_logo_refresh: bool = False, concurrency: dict = None,
+                                start_number: int = 1, control: RunControl = None, logo_files: dict = None):
+    """
+    Same as `run_strips_template`, building slides on a pool of processes.
+
+    Logos and translations for the whole DataFrame are resolved first, in
+    this process, so the shared logo folder and caches are complete before
+    any worker starts. The buyers are then split into ranges of whole
+    slides, each range is rendered into its own copy of `prs` by a worker
+    process (keeping the numbering of a serial run), and the finished
+    slides are merged back into `prs` in order, with their images.
+
+    Each worker pays a few seconds of start-up (a fresh interpreter that
+    imports pandas and python-pptx), so sharding pays off for decks of
+    hundreds of buyers on machines with several cores.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of worker processes; defaults to the number of CPUs.
+
+    See `run_strips_template` for the other parameters.
+    """
+
+    if template_number not in STRIP_LAYOUTS:
+        raise ValueError(f"Unknown template number: {template_number}")
+    _, _, target_lang = STRIP_LAYOUTS[template_number]
+    workers = workers or os.cpu_count() or 1
+    control = control or RunControl()
+
+    print(f"🔍 Resolving logos and translations for {len(df)} buyers...")
+    # Workers draw with these logos, the Lincoln favicon included, and look none up themselves
+    if logo_files is None:
+        logo_files = prefetch_logos(df, brand_api_key, force_refresh=force_logo_refresh)
+    if target_lang:
+        build_translation_table(df, target_lang=target_lang)
+    control.check()
+
+    # Shards hold whole slides, so slide boundaries match a serial run
+    runs_total = (len(df) + ROWS_PER_SLIDE - 1) // ROWS_PER_SLIDE
+    shard_rows = (runs_total + workers - 1) // workers * ROWS_PER_SLIDE
+    shards = [df.iloc[start_idx : start_idx + shard_rows] for start_idx in range(0, len(df), shard_rows)]
+
+    template_io = io.BytesIO()
+    prs.save(template_io)
+    first_new_slide = len(prs.slides)
+    image_cache = ImagePartCache(prs)
+
+    # Worker processes are spawned rather than forked: the caller may be a
+    # threaded server (Streamlit) and forking threads is unsafe
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=multiprocessing.get_context("spawn")) as executor:
+        shard_blobs = executor.map(
+            _build_shard,
+            [template_io.getvalue()] * len(shards),
+            [get_registered_template_file(prs)] * len(shards),
+            [template_number] * len(shards),
+            shards,
+            [brand_api_key] * len(shards),
+            [concurrency] * len(shards),
+            [start_number + i * shard_rows for i in range(len(shards))],
+            [logo_files] * len(shards),
+        )
+        merged = 0
+        try:
+            for i, shard_blob in enumerate(shard_blobs):
+                control.check()
+                copied = merge_slides(prs, Presentation(io.BytesIO(shard_blob)), first_new_slide, image_cache)
+                merged += copied
+                print(f"🧩 Merged shard {i + 1} of {len(shards)} ({copied} slides)")
+                control.report("slides", merged, runs_total, f"Merged {merged} of {runs_total} slides")
+        except RunCancelled:
+            # Shards not started yet are dropped; running ones finish on exit
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    print(f"✅ Finished presentation with {runs_total} slides from {len(shards)} shards.")
+
+
+def run_strips_template_to_file(template_number: int, prs: Presentation, df: pd.DataFrame, brand_api_key,
+                                output_file, force_logo_refresh: bool = False, concurrency: dict = None,
+                                start_number: int = 1, batch_slides: int = STREAM_BATCH_SLIDES,
+                                control: RunControl = None, logo_files: dict = None):
+    """
+    Same as `run_strips_template`, writing the deck straight to `output_file`.
+
+    Slides are rendered in batches of `batch_slides`, each into a fresh copy
+    of `prs`, and every finished batch is written to the output zip and
+    dropped (see `StreamingDeckWriter`), so memory use does not grow with
+    the number of buyers. `prs` itself is left unchanged.
+
+    Parameters
+    ----------
+    output_file : str or file-like
+        Where to write the .pptx.
+
+    batch_slides : int
+        Number of slides kept in memory at a time.
+
+    control : RunControl, optional
+        Receives progress over the whole deck, plus 'writing' as batches are
+        written. A cancelled run leaves an incomplete `output_file`.
+
+    See `run_strips_template` for the other parameters.
+
+    Returns
+    -------
+    int
+        Number of slides written.
+    """
+
+    if template_number not in STRIP_LAYOUTS:
+        raise ValueError(f"Unknown template number: {template_number}")
+
+    template_io = io.BytesIO()
+    prs.save(template_io)
+    first_new_slide = len(prs.slides)
+    writer = StreamingDeckWriter(template_io.getvalue(), output_file)
+
+    control = control or RunControl()
+    batch_rows = batch_slides * ROWS_PER_SLIDE
+    runs_total = (len(df) + ROWS_PER_SLIDE - 1) // ROWS_PER_SLIDE
+    template_file = get_registered_template_file(prs)
+    try:
+        for start_idx in range(0, len(df), batch_rows):
+            batch_prs = writer.new_presentation()
+            if template_file is not None:
+                # Batches then share the template tables cached for the template file
+                register_template_file(batch_prs, template_file)
+            run_strips_template(
+                template_number, batch_prs, df.iloc[start_idx : start_idx + batch_rows], brand_api_key,
+                force_logo_refresh=force_logo_refresh, concurrency=concurrency, start_number=start_number + start_idx,
+                control=control.within(start_idx // ROWS_PER_SLIDE, runs_total), logo_files=logo_files
             )
-        print(f"✅ Finished presentation with {runs_total} slides.")
+            writer.append_slides(batch_prs, first_new_slide)
+            # Parts and packages reference each other, so a finished batch is only
+            # freed by the cycle collector; run it now rather than let batches pile up
+            del batch_prs
+            gc.collect()
+            print(f"💾 Wrote {writer.slides_written} slides to the output file")
+            control.report("writing", writer.slides_written, runs_total, f"Wrote {writer.slides_written} of {runs_total} slides")
+    except BaseException:
+        writer.discard()
+        raise
+
+    writer.close()
+    return writer.slides_written
+
+
+def iter_strips_template_to_file(template_number: int, prs: Presentation, df: pd.DataFrame, brand_api_key,
+                                 output_file, **kwargs):
+    """
+    Incremental version of `run_strips_template_to_file`.
+
+    The deck is built on a background thread while this generator yields
+    a ProgressEvent for every logo resolved, translation batch, slide
+    created and batch written, and a final 'done' event whose `done` is
+    the number of slides written. Closing the generator early cancels the
+    run: no further network call or slide is started.
+
+    Examples
+    --------
+    >>> for event in iter_strips_template_to_file(1, prs, df, key, "deck.pptx"):
+    ...     print(event.stage, event.done, event.total)
+    """
+
+    return iter_progress(run_strips_template_to_file, template_number, prs, df, brand_api_key, output_file, **kwargs)
 
     
+# Decks are generated headless from a manifest with batch.py, e.g.:
+#   python batch.py manifest.json --workers 4
+#prs = load_template("financials_templates.pptx")  # see helpers.template_registry
 #run_strips_template(2, prs=prs, df=df)
 #prs.save(os.path.join(BASE_PATH, "buyers_presentation.pptx"))
\ No newline at end of file
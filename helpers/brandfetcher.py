@@ -1,50 +1,88 @@
 import os
-import requests
 import pandas as pd
+from helpers import http_client
+from helpers.key_pool import DISABLING_STATUSES, as_key_pool
 from helpers.request_helpers import clean_domain, shorten_name
 
+# Overridable so the client can be pointed at a local stand-in server
+BRANDFETCH_API_URL = os.environ.get("BRANDFETCH_API_URL", "https://api.brandfetch.io/v2")
 
+# Statuses meaning Brandfetch has no usable brand for the domain, as opposed
+# to rate limits, key problems or outages that are worth retrying later
+DEFINITIVE_MISS_STATUSES = frozenset({400, 404})
+# Statuses tied to the key rather than the domain: try the next pooled key
+FAILOVER_STATUSES = frozenset({429}) | DISABLING_STATUSES
 
-def get_brandfetch_logo(domain, BRANDFETCH_API_KEY):
-    
-    """
-    Queries the Brandfetch API for a given domain and returns 
-    the direct URL to a PNG logo, prefering 'dark' logos over 'light'.
 
-    This function sends an HTTP GET request to Brandfetch's brand endpoint 
-    for the specified domain (e.g., 'nestle.com') using your API key. 
-    It parses the JSON response and looks for the first available 
-    PNG format of a logo lockup (type 'logo').
+def lookup_brandfetch_logo(domain, BRANDFETCH_API_KEY, cancel_event=None):
+
+    """
+    Queries the Brandfetch API for a given domain and reports whether
+    a missing logo is a definitive answer or a transient failure.
 
     Parameters
     ----------
     domain : str
         The domain name to look up, such as 'nestle.com' or 'afya.com.br'.
 
-    Returns
-    -------
-    str or None
-        A direct URL to the PNG logo file if found, else None if the API 
-        does not return a logo or an error occurs.
+    BRANDFETCH_API_KEY : str or BrandfetchKeyPool
+        A single API key, or a pool of keys to spread lookups over. On a
+        429 or a rejected key the lookup fails over to another pooled key.
 
-    Example
+    cancel_event : threading.Event, optional
+        Once set, the lookup stops retrying and waiting for keys.
+
+    Returns
     -------
-    >>> get_brandfetch_logo("nestle.com")
-    'https://cdn.brandfetch.io/.../logo.png'
+    tuple of (str or None, bool)
+        The PNG logo URL (or None), and whether the result is definitive.
+        A definitive None means Brandfetch answered but has no PNG logo for
+        the domain; a non-definitive None means the request failed (network
+        error, rate limit, invalid key, server error) and may succeed later.
     """
 
-    url = f"https://api.brandfetch.io/v2/brands/{domain}"
-    headers = {
-        "Authorization" : f"Bearer {BRANDFETCH_API_KEY}"
-    }
-    
-    response = requests.get(url, headers=headers)
+    url = f"{BRANDFETCH_API_URL}/brands/{domain}"
+    key_pool = as_key_pool(BRANDFETCH_API_KEY)
+    # 429s are not retried on the same key: the pool fails over to another one
+    retry_statuses = http_client.RETRY_STATUSES - {429}
+
+    for _ in range(len(key_pool.keys) + http_client.MAX_RETRIES):
+        if cancel_event is not None and cancel_event.is_set():
+            return None, False
+        key = key_pool.acquire(cancel_event=cancel_event)
+        if key is None:
+            if cancel_event is None or not cancel_event.is_set():
+                print(f"❌ No Brandfetch API key available to look up {domain}")
+            return None, False
+        headers = {
+            "Authorization" : f"Bearer {key}"
+        }
+        response = http_client.get(url, headers=headers, retry_statuses=retry_statuses, cancel_event=cancel_event)
+        retry_after = None
+        if response is not None and response.status_code == 429:
+            retry_after = http_client.parse_retry_after(response.headers.get("Retry-After"))
+        key_pool.release(key, response, retry_after=retry_after)
+        if response is None or response.status_code not in FAILOVER_STATUSES:
+            break
+
+    if response is None:
+        return None, False
     if response.status_code != 200:
         print(f"Brandfetch did not find a logo for {domain}")
-        return None
-    
-    data = response.json()
-    logos = data.get("logos", [])
+        return None, response.status_code in DEFINITIVE_MISS_STATUSES
+
+    try:
+        data = response.json()
+    except ValueError:
+        return None, False
+    return pick_png_logo(data.get("logos", [])), True
+
+
+def pick_png_logo(logos):
+    """
+    Returns the source URL of the best PNG logo lockup in a Brandfetch
+    `logos` list, prefering 'dark' logos over any other theme, or None.
+    """
 
     # Fisrt look expicitly for a dark theme logo PNG
     for asset in logos:
@@ -62,7 +100,40 @@ def get_brandfetch_logo(domain, BRANDFETCH_API_KEY):
     
     return None
 
-def download_logo_file(logo_url, filename, save_dir= "logos"):
+
+def get_brandfetch_logo(domain, BRANDFETCH_API_KEY):
+    
+    """
+    Queries the Brandfetch API for a given domain and returns 
+    the direct URL to a PNG logo, prefering 'dark' logos over 'light'.
+
+    This function sends an HTTP GET request to Brandfetch's brand endpoint 
+    for the specified domain (e.g., 'nestle.com') using your API key. 
+    It parses the JSON response and looks for the first available 
+    PNG format of a logo lockup (type 'logo'). The request goes through
+    the shared pooled client, so it is bounded by connect/read timeouts
+    and retried with backoff on 429/5xx.
+
+    Parameters
+    ----------
+    domain : str
+        The domain name to look up, such as 'nestle.com' or 'afya.com.br'.
+
+    Returns
+    -------
+    str or None
+        A direct URL to the PNG logo file if found, else None if the API 
+        does not return a logo or an error occurs.
+
+    Example
+    -------
+    >>> get_brandfetch_logo("nestle.com")
+    'https://cdn.brandfetch.io/.../logo.png'
+    """
+
+    return lookup_brandfetch_logo(domain, BRANDFETCH_API_KEY)[0]
+
+def download_logo_file(logo_url, filename, save_dir= "logos", cancel_event=None):
     
     """
     Downloads a PNG logo from a given URL and saves it to the local logos folder.
@@ -84,6 +155,9 @@ def download_logo_file(logo_url, filename, save_dir= "logos"):
         The directory where logos should be saved. Defaults to 'logos'.
         If the directory does not exist, it will be created.
 
+    cancel_event : threading.Event, optional
+        Once set, the download is not retried any more.
+
     Returns
     -------
     str or None
@@ -98,8 +172,8 @@ def download_logo_file(logo_url, filename, save_dir= "logos"):
 
     os.makedirs(save_dir, exist_ok=True)
     path = os.path.join(save_dir, f"{filename}.png")
-    r = requests.get(logo_url)
-    if r.status_code == 200:
+    r = http_client.get(logo_url, cancel_event=cancel_event)
+    if r is not None and r.status_code == 200:
         with open(path, "wb") as f:
             f.write(r.content)
             print(f"✅ Saved logo as {path}")
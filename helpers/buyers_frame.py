@@ -0,0 +1,232 @@
+import numpy as np
+import pandas as pd
+
+# Source columns shown as plain text, converted with str() like the
+# renderers always did (missing values become 'nan', or 'None' where the
+# row keeps None, see `string_rows`)
+TEXT_COLUMNS = [
+    "country", "brazil_investments", "linc_advised",
+    "investment1_shortdesc", "investment2_shortdesc", "investment3_shortdesc",
+    "logo_file", "website",
+    "investment1_logofile", "investment1_website",
+    "investment2_logofile", "investment2_website",
+    "investment3_logofile", "investment3_website",
+]
+
+# Source columns every prepared frame is computed from
+REQUIRED_COLUMNS = ["primary_type", "secondary_type", "dry_powder_latam", "linc_advised"]
+
+# Source columns of the fields prepare_buyers_frame derives
+DERIVED_FIELDS = {
+    "type_label": ["primary_type", "secondary_type"],
+    "dry_powder": ["dry_powder_latam"],
+    "dry_powder_aum": ["dry_powder_latam", "aum_latam"],
+    "is_linc_advised": ["linc_advised"],
+}
+
+# Set on frames returned by prepare_buyers_frame, and kept by their slices
+PREPARED_ATTR = "prepared_for_strips"
+
+# Source columns holding amounts, stored as float64 when every value is a number
+NUMERIC_COLUMNS = ["dry_powder_latam", "aum_latam"]
+
+# Text columns with at most this many distinct values per row are stored as categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def format_number(val):
+    try:
+        return f"{float(val):,.2f}"  # comma as thousand separator + 2 decimals
+    except:
+        return str(val)
+
+
+def string_rows(df):
+    """
+    Boolean mask of the rows made only of strings and missing values.
+
+    `iterrows` rows infer their dtype from their values: pandas reads None
+    as NaN in such string rows, so it displayed as 'nan' (as it does in
+    read_excel text columns), while in any other row None is kept and
+    displayed as 'None'.
+    """
+
+    has_str = np.zeros(len(df), dtype=bool)
+    only_str = np.ones(len(df), dtype=bool)
+    for column in df.columns:
+        series = df[column]
+        missing = series.isna().to_numpy()
+        if pd.api.types.is_object_dtype(series.dtype):
+            is_str = series.map(type).eq(str).to_numpy()
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            is_str = ~missing & pd.api.types.is_string_dtype(series.cat.categories.dtype)
+        elif pd.api.types.is_string_dtype(series.dtype):
+            is_str = ~missing
+        else:
+            is_str = np.zeros(len(df), dtype=bool)
+        has_str |= is_str
+        only_str &= is_str | missing
+    return has_str & only_str
+
+
+def _values(series, none_as_nan):
+    """The series' values as an object array, with None read as NaN in the `none_as_nan` rows."""
+    values = series.to_numpy(dtype=object, copy=True)
+    values[(values == None) & none_as_nan] = np.nan  # noqa: E711, elementwise comparison
+    return values
+
+
+def _as_str(series, none_as_nan):
+    """str() of every value, without a Python-level loop."""
+    return pd.Series(_values(series, none_as_nan).astype(str).astype(object), index=series.index)
+
+
+def format_numbers(series, none_as_nan=True):
+    """
+    Vectorized `format_number`: thousands separators and 2 decimals for
+    numeric values, str() of anything that is not.
+
+    `none_as_nan` (a bool, or a row mask such as `string_rows`) selects
+    where None displays as 'nan' instead of 'None'.
+    """
+
+    series = pd.Series(_values(series, none_as_nan), index=series.index, dtype=object)
+    numbers = pd.to_numeric(series, errors="coerce")
+    valid = numbers.notna()
+    formatted = pd.Series(np.empty(len(series), dtype=object), index=series.index)
+    formatted[valid] = numbers[valid].map("{:,.2f}".format)
+    # Values pandas cannot parse (None, 'n/a', NaN, ...) go through the scalar
+    # version, so the output matches format_number exactly
+    formatted[~valid] = series[~valid].map(format_number)
+    return formatted
+
+
+def format_type_labels(primary_type, secondary_type):
+    """
+    Type column text for every buyer: 'Private Equity' and/or 'Venture Capital'
+    when either type says so, otherwise both types on two lines.
+    """
+
+    is_PE = (primary_type == "PE/Buyout") | (secondary_type == "PE/Buyout")
+    is_VC = (primary_type == "Venture Capital") | (secondary_type == "Venture Capital")
+    labels = np.select(
+        [is_PE & is_VC, is_PE, is_VC],
+        ["Private Equity\nVenture Capital", "Private Equity", "Venture Capital"],
+        default=(primary_type + "\n" + secondary_type).to_numpy(dtype=object),
+    )
+    return pd.Series(labels, index=primary_type.index, dtype=object)
+
+
+def prepare_buyers_frame(df):
+    """
+    Computes every value the strip layouts display, for the whole DataFrame at once.
+
+    Text columns are converted to their display strings, numbers formatted
+    and the type label and flags derived with column-wise operations, so
+    rendering a slide only reads ready-made values instead of redoing the
+    conversions row by row.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The full DataFrame of buyers data.
+
+    Returns
+    -------
+    pd.DataFrame
+        Same index as `df`, with the TEXT_COLUMNS present in `df` as strings, plus:
+        - type_label: text of the type column
+        - dry_powder: formatted dry_powder_latam
+        - dry_powder_aum: 'DP:...\\nAUM:...' (when aum_latam is present)
+        - is_linc_advised: linc_advised is 'Yes'
+    """
+
+    # None displays as the old row-by-row rendering showed it (see `string_rows`)
+    none_as_nan = string_rows(df)
+    prepared = pd.DataFrame(index=df.index)
+    for column in TEXT_COLUMNS:
+        if column in df.columns:
+            prepared[column] = _as_str(df[column], none_as_nan)
+
+    prepared["type_label"] = format_type_labels(
+        _as_str(df["primary_type"], none_as_nan), _as_str(df["secondary_type"], none_as_nan)
+    )
+    prepared["dry_powder"] = format_numbers(df["dry_powder_latam"], none_as_nan)
+    if "aum_latam" in df.columns:
+        prepared["dry_powder_aum"] = (
+            "DP:" + prepared["dry_powder"] + "\nAUM:" + format_numbers(df["aum_latam"], none_as_nan)
+        )
+    prepared["is_linc_advised"] = prepared["linc_advised"] == "Yes"
+
+    prepared.attrs[PREPARED_ATTR] = True
+    return prepared
+
+
+def source_columns(fields):
+    """
+    Returns the source columns needed to display `fields` of the prepared
+    frame, in order and without duplicates, REQUIRED_COLUMNS included.
+    """
+
+    columns = list(REQUIRED_COLUMNS)
+    for field in fields:
+        for column in DERIVED_FIELDS.get(field, [field]):
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def _holds_none(series):
+    # Converted columns read None as NaN, which can change how it displays (see `string_rows`)
+    return pd.api.types.is_object_dtype(series.dtype) and bool((series.to_numpy() == None).any())  # noqa: E711
+
+
+def _is_text_column(series):
+    if not (pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)):
+        return False
+    values = series.dropna()
+    return bool(values.map(type).eq(str).all())
+
+
+def compact_buyers_frame(df):
+    """
+    Returns a copy of the buyers data in compact column types.
+
+    - NUMERIC_COLUMNS whose values are all numbers (or missing) become float64.
+    - Text columns with few distinct values (countries, types, Yes/No flags,
+      logo files, websites, ...) become categoricals, stored once per
+      distinct value instead of once per buyer.
+
+    Columns mixing types, like amounts with 'n/a' in them, and object
+    columns holding None are kept as they are, so `prepare_buyers_frame`
+    displays exactly the same values.
+    """
+
+    compact = df.copy()
+    for column in compact.columns:
+        series = compact[column]
+        if isinstance(series.dtype, pd.CategoricalDtype) or _holds_none(series):
+            continue
+        if column in NUMERIC_COLUMNS and not pd.api.types.is_numeric_dtype(series.dtype):
+            numbers = pd.to_numeric(series, errors="coerce")
+            if numbers.notna().sum() == series.notna().sum():
+                compact[column] = numbers.astype("float64")
+        elif _is_text_column(series) and series.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(series):
+            compact[column] = series.astype("category")
+    return compact
+
+
+def memory_usage_mb(df):
+    """Memory held by a DataFrame, values included, in MB."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def buyer_records(buyers_df):
+    """
+    Returns the display values of each buyer as a list of plain dicts,
+    preparing `buyers_df` first unless it already is (see `prepare_buyers_frame`).
+    """
+
+    if not buyers_df.attrs.get(PREPARED_ATTR):
+        buyers_df = prepare_buyers_frame(buyers_df)
+    return buyers_df.to_dict("records")
@@ -0,0 +1,143 @@
+import os
+import pandas as pd
+from helpers.buyers_frame import compact_buyers_frame, memory_usage_mb
+from helpers.excel_loader import MASK_SHEET, load_financials_mask
+from helpers.run_report import span
+
+# File extension -> input format
+INPUT_FORMATS = {
+    ".xlsx": "excel",
+    ".xlsm": "excel",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".csv": "csv",
+}
+
+
+def get_input_format(file_name):
+    """
+    Returns the input format of a buyers file from its extension.
+
+    Raises
+    ------
+    ValueError
+        If the extension is not one of INPUT_FORMATS.
+    """
+
+    extension = os.path.splitext(str(file_name))[1].lower()
+    if extension not in INPUT_FORMATS:
+        raise ValueError(f"Unsupported buyers file '{file_name}', expected one of: {', '.join(INPUT_FORMATS)}")
+    return INPUT_FORMATS[extension]
+
+
+def _check_columns(available, columns):
+    missing = [column for column in columns if column not in available]
+    if missing:
+        raise ValueError(f"Buyers file is missing columns: {', '.join(missing)}")
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def _read_parquet(source, columns):
+    import pyarrow.parquet as pq
+
+    if columns is not None:
+        _check_columns(pq.ParquetFile(source).schema_arrow.names, columns)
+        _rewind(source)
+    return pd.read_parquet(source, columns=columns)
+
+
+def _read_arrow(source, columns):
+    import pyarrow as pa
+    from pyarrow import feather
+
+    if columns is not None:
+        _check_columns(pa.ipc.open_file(source).schema.names, columns)
+        _rewind(source)
+    return feather.read_table(source, columns=columns).to_pandas()
+
+
+def _read_csv(source, columns):
+    if columns is None:
+        return pd.read_csv(source)
+    header = pd.read_csv(source, nrows=0).columns
+    _check_columns(header, columns)
+    _rewind(source)
+    return pd.read_csv(source, usecols=columns)
+
+
+COLUMNAR_READERS = {
+    "parquet": _read_parquet,
+    "arrow": _read_arrow,
+    "csv": _read_csv,
+}
+
+
+def load_buyers_file(source, columns=None, input_format=None, sheet_name=MASK_SHEET, compact=True):
+    """
+    Loads buyers data from an Excel mask workbook or a columnar file.
+
+    Parquet, Arrow (Feather / IPC file) and CSV files hold the buyers table
+    directly, with the columns named as the templates expect
+    (`primary_type`, `dry_powder_latam`, `investment1_logofile`, ...); only
+    `columns` are read from them, so a layout does not pay for fields it
+    never shows. Excel workbooks go through `load_financials_mask`.
+
+    Parameters
+    ----------
+    source : str, path or file-like
+        The buyers file.
+
+    columns : list of str, optional
+        Columns to load (see `get_layout_columns`); all of them if None.
+
+    input_format : str, optional
+        'excel', 'parquet', 'arrow' or 'csv'; guessed from the file name if None.
+
+    sheet_name : str
+        Sheet of the mask, for Excel workbooks.
+
+    compact : bool
+        Store the table in compact column types (see `compact_buyers_frame`)
+        and print the memory saved; the sizes in MB are kept in
+        `df.attrs['memory_mb']` as (loaded, compact).
+
+    Returns
+    -------
+    pd.DataFrame
+        The buyers, with `columns` in that order when given.
+
+    Raises
+    ------
+    ValueError
+        If the format is unsupported or the file lacks one of `columns`.
+    """
+
+    if input_format is None:
+        input_format = get_input_format(getattr(source, "name", source))
+
+    with span("ingest"):
+        if input_format == "excel":
+            df = load_financials_mask(source, sheet_name=sheet_name)
+            if columns is not None:
+                _check_columns(df.columns, columns)
+        elif input_format in COLUMNAR_READERS:
+            df = COLUMNAR_READERS[input_format](source, columns)
+        else:
+            raise ValueError(f"Unsupported input format '{input_format}'")
+
+    if columns is not None:
+        df = df[columns]
+    if compact:
+        loaded_mb = float(memory_usage_mb(df))
+        df = compact_buyers_frame(df)
+        compact_mb = float(memory_usage_mb(df))
+        df.attrs["memory_mb"] = (loaded_mb, compact_mb)
+        print(f"🗜️ Buyers table: {loaded_mb:.2f} MB as loaded, {compact_mb:.2f} MB compacted")
+    return df
@@ -0,0 +1,177 @@
+from pptx.dml.color import RGBColor
+from pptx.oxml.ns import qn
+from pptx.oxml.text import CT_RegularTextRun
+from pptx.text.text import _Run
+
+_escape_ctrl_chars = CT_RegularTextRun._escape_ctrl_chars
+
+_TXBODY = qn("a:txBody")
+_TEXT = qn("a:t")
+
+
+def write_cell_text(cell, text, remove_trailing=True):
+    """
+    Writes `text` into the first run of a table cell, keeping that run's formatting.
+
+    This is the generic path, working on any cell: it scans the paragraphs for
+    the first one with a run, adds a paragraph with a default run if there is
+    none, and (optionally) removes every paragraph after the one written.
+
+    Parameters
+    ----------
+    cell : pptx.table._Cell
+    text : str
+    remove_trailing : bool
+        Remove the paragraphs after the written one.
+    """
+
+    text_frame = cell.text_frame
+    found_index = None
+    for idx, para in enumerate(text_frame.paragraphs):
+        if para.runs:
+            para.runs[0].text = text  # Assumes same formating for the whole text
+            found_index = idx
+            break
+    else:
+        # if none of the paragraphs had a run text is added with default formating
+        para = text_frame.add_paragraph()
+        run = para.add_run()
+        run.text = text
+        found_index = len(text_frame.paragraphs) - 1
+
+    if remove_trailing:
+        for idx, extra_para in reversed(list(enumerate(text_frame.paragraphs))):
+            if idx > found_index:
+                text_frame._element.remove(extra_para._element)
+            else:
+                break
+
+
+def write_cell_mark(cell, mark, color):
+    """
+    Writes a single mark character (e.g. ✓/✘) into the first run of the first
+    paragraph of a cell and colors it, replacing the cell content when that
+    paragraph has no run.
+    """
+
+    text_frame = cell.text_frame
+    if text_frame.paragraphs and text_frame.paragraphs[0].runs:
+        run = text_frame.paragraphs[0].runs[0]
+    else:
+        text_frame.clear()
+        run = text_frame.add_paragraph().add_run()
+    run.text = mark
+    run.font.color.rgb = color
+
+
+class CellSlot:
+    """
+    Where text goes in one cell of a template table.
+
+    `text_idx` and `body_idx` are the document-order positions of the a:t
+    element to write and of the cell's a:txBody among all a:t and a:txBody
+    elements of the table, so one pass over a fresh copy of the table finds
+    every target. `para_pos` is the child position of the written paragraph
+    in its txBody, and `trailing` the number of paragraphs after it.
+    """
+
+    def __init__(self, text_idx, body_idx, para_pos, trailing, first_paragraph):
+        self.text_idx = text_idx
+        self.body_idx = body_idx
+        self.para_pos = para_pos
+        self.trailing = trailing
+        self.first_paragraph = first_paragraph
+
+
+def compile_cell_slots(table_element):
+    """
+    Resolves, once per template table, the run each cell's text is written to.
+
+    Mirrors `write_cell_text`: the target is the first run of the first
+    paragraph that has one. Cells without any run get no slot and are
+    written through the generic path instead.
+
+    Parameters
+    ----------
+    table_element : lxml element
+        The template table's graphicFrame (or a:tbl) element.
+
+    Returns
+    -------
+    dict
+        Mapping of (row_idx, col_idx) to CellSlot.
+    """
+
+    # The element lists keep their proxies alive, so the ids below stay valid
+    # and are the ones lxml hands back when the same elements are reached again
+    texts = list(table_element.iter(_TEXT))
+    bodies = list(table_element.iter(_TXBODY))
+    text_positions = {id(t): idx for idx, t in enumerate(texts)}
+    body_positions = {id(body): idx for idx, body in enumerate(bodies)}
+
+    tbl = table_element if table_element.tag == qn("a:tbl") else table_element.find(".//" + qn("a:tbl"))
+    slots = {}
+    for row_idx, tr in enumerate(tbl.tr_lst):
+        for col_idx, tc in enumerate(tr.tc_lst):
+            txBody = tc.txBody
+            if txBody is None:
+                continue
+            paragraphs = txBody.p_lst
+            for para_idx, p in enumerate(paragraphs):
+                if p.r_lst:
+                    slots[(row_idx, col_idx)] = CellSlot(
+                        text_idx=text_positions[id(p.r_lst[0].t)],
+                        body_idx=body_positions[id(txBody)],
+                        para_pos=txBody.index(p),
+                        trailing=len(paragraphs) - para_idx - 1,
+                        first_paragraph=para_idx == 0,
+                    )
+                    break
+    return slots
+
+
+class CompiledTableWriter:
+    """
+    Writes cell values straight into a freshly stamped copy of a template table.
+
+    Built with the table's compiled slots, it resolves every target element
+    of the new copy in a single pass, after which each write is an
+    attribute assignment and trailing paragraphs are dropped with one slice
+    deletion, instead of building python-pptx proxies for every paragraph
+    and run of the cell.
+
+    Parameters
+    ----------
+    table_shape : pptx.shapes.graphfrm.GraphicFrame
+        The table shape just copied onto a slide.
+
+    slots : dict
+        The template table's slots, from `compile_cell_slots`.
+    """
+
+    def __init__(self, table_shape, slots):
+        self.table_shape = table_shape
+        self.slots = slots
+        element = table_shape.element
+        self._texts = list(element.iter(_TEXT))
+        self._bodies = list(element.iter(_TXBODY))
+
+    def write_text(self, row_idx, col_idx, text, remove_trailing=True):
+        """Fast-path equivalent of `write_cell_text` for the cell at (row_idx, col_idx)."""
+        slot = self.slots.get((row_idx, col_idx))
+        if slot is None:
+            write_cell_text(self.table_shape.table.cell(row_idx, col_idx), text, remove_trailing)
+            return
+        self._texts[slot.text_idx].text = _escape_ctrl_chars(text)
+        if remove_trailing and slot.trailing:
+            del self._bodies[slot.body_idx][slot.para_pos + 1:]
+
+    def write_mark(self, row_idx, col_idx, mark, color: RGBColor):
+        """Fast-path equivalent of `write_cell_mark` for the cell at (row_idx, col_idx)."""
+        slot = self.slots.get((row_idx, col_idx))
+        if slot is None or not slot.first_paragraph:
+            write_cell_mark(self.table_shape.table.cell(row_idx, col_idx), mark, color)
+            return
+        run = _Run(self._texts[slot.text_idx].getparent(), None)
+        run.text = mark
+        run.font.color.rgb = color
@@ -1,11 +1,15 @@
 from pptx import Presentation, slide
-from copy import deepcopy
+from helpers.template_tables import get_template_table
 
 def copy_table_from_template_slide(prs: Presentation, source_slide_idx: int, target_slide: slide.Slide):
 
     """
     Copies the first table found on a template slide into the target slide.
 
+    The template table is located and snapshotted once per template file and
+    slide index (see `get_template_table`); each call only stamps a copy of
+    that snapshot, without scanning the template slide again.
+
     Parameters
     ----------
     prs : pptx.Presentation
@@ -18,20 +22,18 @@ def copy_table_from_template_slide(prs: Presentation, source_slide_idx: int, tar
     target_slide : pptx.slide.Slide
         The slide object where the copied table will be inserted.
 
+    Returns
+    -------
+    pptx.shapes.graphfrm.GraphicFrame
+        The table shape inserted into the target slide.
+
     Raises
     ------
     ValueError
         If no table is found on the source slide.
     """
 
-    source_slide = prs.slides[source_slide_idx]
-
-    for shape in source_slide.shapes:
-        if shape.has_table:
-            # Clone the underlying XML element
-            new_element = deepcopy(shape.element)
-            # Insert into the new slide's shape tree
-            target_slide.shapes._spTree.insert_element_before(new_element, 'p:extLst')
-            return
-        
-    raise ValueError(f"No table found on slide {source_slide_idx} to copy")
\ No newline at end of file
+    new_element = get_template_table(prs, source_slide_idx).new_table_element()
+    # Insert into the new slide's shape tree
+    target_slide.shapes._spTree.insert_element_before(new_element, 'p:extLst')
+    return target_slide.shapes._shape_factory(new_element)
\ No newline at end of file
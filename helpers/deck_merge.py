@@ -0,0 +1,90 @@
+from copy import deepcopy
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+
+_R_NAMESPACE = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+# Children of p:spTree that describe the tree itself rather than a shape
+_SHAPE_TREE_PROPERTIES = {qn("p:nvGrpSpPr"), qn("p:grpSpPr"), qn("p:extLst")}
+
+
+def copy_slide(target_prs, source_slide, image_cache):
+    """
+    Appends a copy of a slide of another presentation to `target_prs`.
+
+    Both presentations must come from the same template file: the copy
+    uses the target's slide layout at the same index as the source slide's.
+    Shapes are copied as they are, pictures are re-related to the target's
+    own image parts (deduplicated by content through `image_cache`) and
+    external relationships (hyperlinks) are carried over.
+
+    Parameters
+    ----------
+    target_prs : pptx.Presentation
+        The presentation receiving the slide.
+
+    source_slide : pptx.slide.Slide
+        The slide to copy.
+
+    image_cache : ImagePartCache
+        Image cache of `target_prs`.
+
+    Returns
+    -------
+    pptx.slide.Slide
+        The new slide.
+
+    Raises
+    ------
+    ValueError
+        If the slide relates to parts other than images (charts, notes, ...).
+    """
+
+    source_layouts = list(source_slide.part.package.presentation_part.presentation.slide_layouts)
+    layout_index = source_layouts.index(source_slide.slide_layout)
+    new_slide = target_prs.slides.add_slide(target_prs.slide_layouts[layout_index])
+
+    # Re-create every relationship of the source slide on the new one
+    rIds = {}
+    for rId, rel in source_slide.part.rels.items():
+        if rel.reltype == RT.SLIDE_LAYOUT:
+            continue
+        if rel.is_external:
+            rIds[rId] = new_slide.part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+        elif rel.reltype == RT.IMAGE:
+            rIds[rId] = new_slide.part.relate_to(image_cache.import_image_part(rel.target_part), RT.IMAGE)
+        else:
+            raise ValueError(f"Cannot merge a slide related to {rel.reltype}")
+
+    # Swap the placeholders cloned from the layout for the source slide's shapes
+    target_tree = new_slide.shapes._spTree
+    for shape_element in [el for el in target_tree if el.tag not in _SHAPE_TREE_PROPERTIES]:
+        target_tree.remove(shape_element)
+    for shape_element in source_slide.shapes._spTree:
+        if shape_element.tag in _SHAPE_TREE_PROPERTIES:
+            continue
+        new_element = deepcopy(shape_element)
+        for element in new_element.iter():
+            for attribute, value in element.attrib.items():
+                if attribute.startswith(_R_NAMESPACE) and value in rIds:
+                    element.set(attribute, rIds[value])
+        target_tree.insert_element_before(new_element, "p:extLst")
+
+    return new_slide
+
+
+def merge_slides(target_prs, source_prs, first_slide_idx, image_cache):
+    """
+    Appends the slides of `source_prs` from `first_slide_idx` on to `target_prs`,
+    in order (see `copy_slide`).
+
+    Returns
+    -------
+    int
+        Number of slides copied.
+    """
+
+    slides = list(source_prs.slides)[first_slide_idx:]
+    for slide in slides:
+        copy_slide(target_prs, slide, image_cache)
+    return len(slides)
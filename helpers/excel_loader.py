@@ -0,0 +1,122 @@
+import time
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+try:
+    import python_calamine  # noqa: F401, optional Rust engine, much faster than openpyxl
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+MASK_SHEET = "Python Financials Mask"
+MASK_USECOLS = "B:B, E:N, P:V, X:AD, AF:AK"
+MASK_HEADER_ROW = 1  # 0-based: the column names are on the sheet's second row
+MASK_KEY_COLUMN = "fund_name"
+
+# Literal values openpyxl gives for error cells, which read_excel turns into NaN
+EXCEL_ERRORS = {"#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A", "#GETTING_DATA"}
+
+
+def _column_indices(usecols):
+    """Converts an Excel column spec like 'B:B, E:N' into 0-based column indices."""
+    from openpyxl.utils import column_index_from_string
+
+    indices = []
+    for column_range in usecols.split(","):
+        first, _, last = column_range.strip().partition(":")
+        first_idx = column_index_from_string(first) - 1
+        last_idx = column_index_from_string(last or first) - 1
+        indices.extend(range(first_idx, last_idx + 1))
+    return indices
+
+
+def _convert_value(value):
+    # Same conversions as pandas' openpyxl reader: empty cells are '', whole
+    # numbers become ints and error cells NaN
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in EXCEL_ERRORS:
+        return float("nan")
+    return value
+
+
+def _read_mask_rows(source, sheet_name, usecols):
+    """
+    Reads the needed columns of one sheet with openpyxl in read-only mode,
+    up to the last row with a value in the key column.
+    """
+    from openpyxl import load_workbook
+
+    indices = _column_indices(usecols)
+    key_idx = indices[0]
+    max_col = max(indices) + 1
+
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook[sheet_name]
+        sheet.reset_dimensions()
+        rows = []
+        last_key_row = MASK_HEADER_ROW
+        for row_number, row in enumerate(sheet.iter_rows(max_col=max_col, values_only=True)):
+            converted = [_convert_value(value) for value in row]
+            converted.extend([""] * (max_col - len(converted)))
+            rows.append(converted)
+            if row_number > MASK_HEADER_ROW and converted[key_idx] != "":
+                last_key_row = row_number
+    finally:
+        workbook.close()
+
+    # Rows after the last buyer would all be dropped for lacking a fund_name
+    return rows[: last_key_row + 1], indices
+
+
+def load_financials_mask(source, sheet_name=MASK_SHEET, usecols=MASK_USECOLS):
+    """
+    Loads the buyers of a 'Python Financials Mask' workbook.
+
+    Returns the same DataFrame as
+
+        pd.read_excel(source, sheet_name=sheet_name, header=1, usecols=usecols)
+          .dropna(subset=['fund_name']).drop(columns=['fund_name'])
+
+    without parsing more of the workbook than needed: the python-calamine
+    engine is used when installed; otherwise openpyxl streams the sheet in
+    read-only mode, reading only the columns up to the last one used and
+    stopping the frame at the last row with a fund_name. Rows go through
+    pandas' own TextParser, so column names and types are inferred exactly
+    like read_excel does (values in rows past the last buyer are ignored).
+    The time taken is printed and kept in `df.attrs['ingest_seconds']`.
+
+    Parameters
+    ----------
+    source : str, path or file-like
+        The workbook (.xlsx).
+
+    sheet_name : str
+        Sheet holding the mask.
+
+    usecols : str
+        Excel column ranges to read; the first one must be fund_name.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+
+    start = time.perf_counter()
+    if HAS_CALAMINE:
+        engine = "calamine"
+        df = pd.read_excel(source, sheet_name=sheet_name, header=MASK_HEADER_ROW, usecols=usecols, engine="calamine")
+    else:
+        engine = "openpyxl read-only"
+        rows, indices = _read_mask_rows(source, sheet_name, usecols)
+        df = TextParser(rows, header=MASK_HEADER_ROW, usecols=indices, skip_blank_lines=False).read()
+
+    df = df.dropna(subset=[MASK_KEY_COLUMN]).drop(columns=[MASK_KEY_COLUMN])
+    elapsed = time.perf_counter() - start
+    df.attrs["ingest_seconds"] = elapsed
+    df.attrs["ingest_engine"] = engine
+    print(f"📥 Loaded {len(df)} buyers from '{sheet_name}' in {elapsed:.2f}s ({engine})")
+    return df
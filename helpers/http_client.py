@@ -0,0 +1,155 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from helpers.run_report import count
+
+CONNECT_TIMEOUT = 5  # seconds to establish the TCP/TLS connection
+READ_TIMEOUT = 20  # seconds to wait between bytes of the response
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # first retry waits 0.5s, then 1s, 2s, ...
+BACKOFF_MAX = 30
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+POOL_MAXSIZE = 16  # keep-alive connections kept per host
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the process-wide `requests.Session` shared by every outbound call.
+
+    The session keeps connections alive per host, so repeated Brandfetch
+    lookups and CDN downloads reuse the same TLS connection instead of
+    paying a fresh handshake on every request.
+
+    Returns
+    -------
+    requests.Session
+        The shared session, created on first use.
+    """
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+def parse_retry_after(value):
+    """
+    Parses a `Retry-After` header into a number of seconds.
+
+    Parameters
+    ----------
+    value : str or None
+        The header value, either delta-seconds ('120') or an HTTP date.
+
+    Returns
+    -------
+    float or None
+        Seconds to wait, or None if the header is missing or malformed.
+    """
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(attempt, retry_after=None):
+    """
+    Returns how long to wait before retry number `attempt` (starting at 0).
+
+    A server-provided `Retry-After` always wins over the exponential backoff.
+    """
+
+    if retry_after is not None:
+        return retry_after
+    return min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+
+
+def _wait(delay, cancel_event):
+    # Sleeps before a retry; returns False if cancelled meanwhile
+    if cancel_event is None:
+        time.sleep(delay)
+        return True
+    return not cancel_event.wait(delay)
+
+
+def get(url, headers=None, timeout=None, max_retries=MAX_RETRIES, retry_statuses=RETRY_STATUSES, cancel_event=None):
+    """
+    Sends a GET request through the shared session with timeouts and retries.
+
+    Connection errors, timeouts and responses whose status is in
+    `retry_statuses` are retried with exponential backoff. A `Retry-After`
+    header on those responses is honoured, unless it asks for a longer wait
+    than BACKOFF_MAX, in which case the response is returned right away so
+    the caller can decide what to do (e.g. an exhausted API quota).
+
+    Parameters
+    ----------
+    url : str
+        The URL to request.
+
+    headers : dict, optional
+        Extra request headers, such as Authorization.
+
+    timeout : tuple of (float, float), optional
+        Connect and read timeouts in seconds; defaults to (CONNECT_TIMEOUT, READ_TIMEOUT).
+
+    max_retries : int
+        Number of retries after the first attempt.
+
+    retry_statuses : collection of int
+        HTTP status codes that should be retried.
+
+    cancel_event : threading.Event, optional
+        Once set, no retry is started and any backoff wait ends at once
+        (see `RunControl.cancel_event`).
+
+    Returns
+    -------
+    requests.Response or None
+        The last response received, or None if no response could be obtained
+        (connection error or timeout on every attempt, or cancellation).
+    """
+
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    session = get_session()
+    for attempt in range(max_retries + 1):
+        count("http_requests")
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            if attempt == max_retries:
+                print(f"❌ Request to {url} failed: {e}")
+                return None
+            if not _wait(backoff_delay(attempt), cancel_event):
+                return None
+            continue
+
+        if response.status_code not in retry_statuses or attempt == max_retries:
+            return response
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None and retry_after > BACKOFF_MAX:
+            return response
+        if not _wait(backoff_delay(attempt, retry_after), cancel_event):
+            return response
+        response.close()
+
+    return None
@@ -0,0 +1,257 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from helpers.logo_resources import BASE_PATH, collect_logo_requests, ensure_logo_available, get_lincoln_file_path, needs_lincoln_logo
+from helpers.progress import CANCEL_POLL_INTERVAL, RunControl
+from helpers.run_report import count
+from helpers.translation_cache import get_translation_cache
+from translate_helpers import TRANSLATION_BATCH_SIZE, collect_translatable_texts, translate_batch
+
+# Maximum concurrent calls per upstream service. Resolving a logo covers both
+# the Brandfetch lookup and the CDN download of the PNG it points to.
+DEFAULT_CONCURRENCY = {
+    "brandfetch": 8,
+    "translate": 8,
+}
+
+
+class ChunkResourceResolver:
+    """
+    Resolves the logos and translations each slide chunk needs, on an asyncio loop.
+
+    Every chunk is scheduled as soon as the pipeline starts; the per-upstream
+    semaphores bound how many calls are actually in flight, and because they
+    wake waiters in order, earlier chunks are served first. Logos and strings
+    shared between chunks are only ever requested once.
+
+    Must be created and used inside a running event loop.
+
+    Parameters
+    ----------
+    brand_api_key : str or BrandfetchKeyPool
+        Brandfetch key (or pool of keys) used for missing logos.
+
+    target_lang : str, optional
+        Language to translate into, or None for layouts without translation.
+
+    concurrency : dict, optional
+        Overrides for DEFAULT_CONCURRENCY, keyed by upstream name.
+
+    force_logo_refresh : bool
+        Re-check domains cached as known Brandfetch misses.
+
+    control : RunControl, optional
+        Receives 'logos' and 'translations' progress as calls complete.
+
+    logo_files : dict, optional
+        Logos already resolved (see `prefetch_logos`), as logo name to file
+        path or None; they are not looked up again.
+    """
+
+    def __init__(self, brand_api_key, target_lang=None, concurrency=None, force_logo_refresh=False, logo_base_dir="logos",
+                 control=None, logo_files=None):
+        self.brand_api_key = brand_api_key
+        self.target_lang = target_lang
+        self.force_logo_refresh = force_logo_refresh
+        self.logo_base_dir = logo_base_dir
+        self.control = control or RunControl()
+        self.logos_total = self.logos_done = 0
+        self.translations_total = self.translations_done = 0
+        self.limits = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self._semaphores = {upstream: asyncio.Semaphore(limit) for upstream, limit in self.limits.items()}
+        self._logo_tasks = {}
+        self._logo_files = dict(logo_files or {})
+        self._translation_tasks = {}
+        self._translations = {}
+
+    def prime(self, df):
+        """
+        Loads every translation already in the cache for the whole DataFrame
+        with one query, so only real misses are scheduled chunk by chunk.
+        """
+
+        if self.target_lang:
+            cached = get_translation_cache().get_many(set(collect_translatable_texts(df)), self.target_lang)
+            count("translation_cache_hits", len(cached))
+            self._translations.update(cached)
+        if "linc_favi" in self._logo_files:
+            return
+        if needs_lincoln_logo(df):
+            self.logos_total += 1
+            self._logo_tasks["linc_favi"] = asyncio.create_task(self._resolve_lincoln_logo())
+
+    def _logo_resolved(self):
+        self.logos_done += 1
+        self.control.report("logos", self.logos_done, self.logos_total, f"Resolved logo {self.logos_done} of {self.logos_total}")
+
+    async def _resolve_lincoln_logo(self):
+        async with self._semaphores["brandfetch"]:
+            logo_file = await asyncio.to_thread(
+                get_lincoln_file_path, logo_name="linc_favi", brand_api_key=self.brand_api_key,
+                cancel_event=self.control.cancel_event
+            )
+        self._logo_files["linc_favi"] = logo_file
+        self._logo_resolved()
+        return logo_file
+
+    async def _resolve_logo(self, logo_name, domain):
+        async with self._semaphores["brandfetch"]:
+            logo_file = await asyncio.to_thread(
+                ensure_logo_available, logo_name, domain, brand_api_key=self.brand_api_key,
+                logo_base_dir=self.logo_base_dir, force_refresh=self.force_logo_refresh,
+                cancel_event=self.control.cancel_event
+            )
+        self._logo_files[logo_name] = logo_file
+        self._logo_resolved()
+        return logo_file
+
+    async def _translate(self, batch):
+        async with self._semaphores["translate"]:
+            results = await asyncio.to_thread(translate_batch, batch, self.target_lang)
+        self.translations_done += len(batch)
+        self.control.report(
+            "translations", self.translations_done, self.translations_total,
+            f"Translated {self.translations_done} of {self.translations_total} strings"
+        )
+        get_translation_cache().put_many(results, self.target_lang)
+        # Like translate_text, strings that failed to translate keep their source text
+        return {text: results.get(text, text) for text in batch}
+
+    def schedule(self, chunk_df):
+        """
+        Starts resolving everything `chunk_df` needs and returns a task that
+        completes with the chunk's (logo files, translation table): logo
+        name to file path or None, and source text to translation (None
+        without translation).
+        """
+
+        logo_dir = os.path.join(BASE_PATH, self.logo_base_dir)
+        logo_requests = collect_logo_requests(chunk_df)
+        logo_names = list(logo_requests)
+        logo_tasks = []
+        for logo_name, domain in logo_requests.items():
+            if logo_name in self._logo_files:
+                continue
+            if logo_name not in self._logo_tasks:
+                logo_file = os.path.join(logo_dir, f"{logo_name}.png")
+                if os.path.exists(logo_file):
+                    count("logo_file_hits")
+                    self._logo_files[logo_name] = logo_file
+                    continue
+                self.logos_total += 1
+                self._logo_tasks[logo_name] = asyncio.create_task(self._resolve_logo(logo_name, domain))
+            logo_tasks.append(self._logo_tasks[logo_name])
+        if "linc_favi" in self._logo_tasks or "linc_favi" in self._logo_files:
+            logo_names.append("linc_favi")
+            if "linc_favi" in self._logo_tasks:
+                logo_tasks.append(self._logo_tasks["linc_favi"])
+
+        texts = []
+        if self.target_lang:
+            texts = list(dict.fromkeys(text for text in collect_translatable_texts(chunk_df) if text))
+            new_texts = [
+                text for text in texts
+                if text not in self._translations and text not in self._translation_tasks
+            ]
+            for start in range(0, len(new_texts), TRANSLATION_BATCH_SIZE):
+                batch = new_texts[start:start + TRANSLATION_BATCH_SIZE]
+                self.translations_total += len(batch)
+                task = asyncio.create_task(self._translate(batch))
+                for text in batch:
+                    self._translation_tasks[text] = task
+
+        return asyncio.create_task(self._gather_chunk(logo_names, logo_tasks, texts))
+
+    async def _gather_chunk(self, logo_names, logo_tasks, texts):
+        await asyncio.gather(*logo_tasks)
+        logo_files = {logo_name: self._logo_files[logo_name] for logo_name in logo_names}
+        if not self.target_lang:
+            return logo_files, None
+        for text in texts:
+            if text not in self._translations:
+                self._translations.update(await self._translation_tasks[text])
+        return logo_files, {text: self._translations[text] for text in texts}
+
+
+async def _wait(task, control):
+    # Waits for a task, checking for a cancellation meanwhile; RunCancelled
+    # then unwinds the pipeline and asyncio.run cancels every pending call
+    while not task.done():
+        await asyncio.wait({task}, timeout=CANCEL_POLL_INTERVAL)
+        control.check()
+    return task.result()
+
+
+async def _run_pipeline(df, chunks, render_chunk, resolver_options):
+    resolver = ChunkResourceResolver(**resolver_options)
+    control = resolver.control
+    loop = asyncio.get_running_loop()
+    # One thread per allowed upstream call, plus one for rendering
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=sum(resolver.limits.values()) + 1))
+
+    resolver.prime(df)
+    pending = [resolver.schedule(chunk_df) for chunk_df, _ in chunks]
+    if resolver.logos_total:
+        control.report("logos", 0, resolver.logos_total, f"Resolving {resolver.logos_total} logos")
+    if resolver.translations_total:
+        control.report("translations", 0, resolver.translations_total, f"Translating {resolver.translations_total} strings")
+    for (chunk_df, start_number), chunk_task in zip(chunks, pending):
+        logo_files, translations = await _wait(chunk_task, control)
+        control.check()
+        # Rendering runs off the loop so I/O for the next chunks keeps flowing meanwhile
+        await asyncio.to_thread(render_chunk, chunk_df, start_number, translations, logo_files)
+
+
+def run_pipeline(df, chunks, render_chunk, brand_api_key, target_lang=None, concurrency=None, force_logo_refresh=False,
+                 control=None, logo_files=None):
+    """
+    Renders slide chunks in order while their network I/O runs concurrently.
+
+    Logo resolution and translation for upcoming chunks overlap with the
+    rendering of the current one, so the wall time of a run is bounded by
+    the slowest upstream instead of the sum of every call.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The full DataFrame of buyers data.
+
+    chunks : list of (pd.DataFrame, int)
+        Slide chunks of `df` with the number of their first row.
+
+    render_chunk : callable
+        Called as render_chunk(chunk_df, start_number, translations, logo_files)
+        for each chunk in order, once its logos are resolved and its strings
+        translated; `logo_files` maps each logo name of the chunk to its file
+        path, or None when it could not be obtained.
+
+    brand_api_key : str or BrandfetchKeyPool
+        Brandfetch key (or pool of keys) used for missing logos.
+
+    target_lang : str, optional
+        Language to translate into, or None for layouts without translation.
+
+    concurrency : dict, optional
+        Maximum concurrent calls per upstream ('brandfetch', 'translate').
+
+    force_logo_refresh : bool
+        Re-check domains cached as known Brandfetch misses.
+
+    control : RunControl, optional
+        Receives 'logos' and 'translations' progress. Once cancelled, the
+        pipeline stops before the next chunk, or while waiting on one, and
+        raises RunCancelled; calls not started yet are dropped.
+
+    logo_files : dict, optional
+        Logos already resolved (see `prefetch_logos`), not looked up again.
+    """
+
+    resolver_options = {
+        "brand_api_key": brand_api_key,
+        "target_lang": target_lang,
+        "concurrency": concurrency,
+        "force_logo_refresh": force_logo_refresh,
+        "control": control,
+        "logo_files": logo_files,
+    }
+    asyncio.run(_run_pipeline(df, chunks, render_chunk, resolver_options))
@@ -0,0 +1,161 @@
+import threading
+import time
+from helpers.progress import CANCEL_POLL_INTERVAL
+
+DEFAULT_COOLDOWN = 5  # seconds a key rests after a 429 without Retry-After
+MAX_WAIT = 30  # longest we block waiting for a cooling-down key
+DISABLING_STATUSES = frozenset({401, 403})  # invalid key or quota revoked
+
+
+class BrandfetchKeyPool:
+    """
+    Spreads Brandfetch lookups across every configured API key.
+
+    Each lookup borrows the least busy usable key (fewest requests in
+    flight, then fewest requests sent), and reports the response back.
+    A 429 puts the key in cooldown for its `Retry-After` (or
+    DEFAULT_COOLDOWN) so other keys take over, and a 401/403 disables the
+    key for the lifetime of the pool. Safe to share between threads.
+
+    Parameters
+    ----------
+    keys : dict or list
+        Either a mapping of label to API key (e.g. {'Key 1': '...'}) or a
+        plain list of keys. Empty keys are ignored.
+    """
+
+    def __init__(self, keys):
+        if not isinstance(keys, dict):
+            keys = {f"Key {i + 1}": key for i, key in enumerate(keys)}
+        self._lock = threading.Condition()
+        self._stats = {
+            key: {"label": label, "requests": 0, "rate_limited": 0, "in_flight": 0, "cooldown_until": 0.0, "disabled": False}
+            for label, key in keys.items() if key
+        }
+        if not self._stats:
+            raise ValueError("At least one Brandfetch API key is required")
+
+    def __getstate__(self):
+        # Pools are handed to worker processes with their current key state;
+        # the lock itself cannot be pickled and is recreated on arrival
+        with self._lock:
+            return {"stats": {key: dict(stats, in_flight=0) for key, stats in self._stats.items()}}
+
+    def __setstate__(self, state):
+        self._lock = threading.Condition()
+        self._stats = state["stats"]
+
+    @property
+    def keys(self):
+        return list(self._stats)
+
+    def _usable(self, now):
+        return [
+            key for key, stats in self._stats.items()
+            if not stats["disabled"] and stats["cooldown_until"] <= now
+        ]
+
+    def acquire(self, max_wait=MAX_WAIT, cancel_event=None):
+        """
+        Borrows the least busy usable key.
+
+        If every key is cooling down, waits for the first one to come back
+        as long as that is within `max_wait` seconds, and `cancel_event`
+        (a threading.Event) is not set.
+
+        Returns
+        -------
+        str or None
+            The API key to use, or None if no key can be used any more
+            or the wait was cancelled.
+        """
+
+        with self._lock:
+            while True:
+                now = time.time()
+                usable = self._usable(now)
+                if usable:
+                    key = min(usable, key=lambda k: (self._stats[k]["in_flight"], self._stats[k]["requests"]))
+                    self._stats[key]["in_flight"] += 1
+                    self._stats[key]["requests"] += 1
+                    return key
+
+                cooling = [stats["cooldown_until"] for stats in self._stats.values() if not stats["disabled"]]
+                if not cooling or min(cooling) - now > max_wait:
+                    return None
+                if cancel_event is None:
+                    self._lock.wait(min(cooling) - now)
+                    continue
+                if cancel_event.is_set():
+                    return None
+                # The condition cannot also wait on the event, so check it between short waits
+                self._lock.wait(min(min(cooling) - now, CANCEL_POLL_INTERVAL))
+
+    def release(self, key, response, retry_after=None):
+        """
+        Returns a borrowed key, updating its state from the response.
+
+        Parameters
+        ----------
+        key : str
+            The key returned by `acquire`.
+
+        response : requests.Response or None
+            The response obtained with the key (None on network failure).
+
+        retry_after : float, optional
+            Parsed `Retry-After` of a 429 response, in seconds.
+        """
+
+        with self._lock:
+            stats = self._stats[key]
+            stats["in_flight"] -= 1
+            if response is not None and response.status_code == 429:
+                stats["rate_limited"] += 1
+                stats["cooldown_until"] = time.time() + (retry_after if retry_after is not None else DEFAULT_COOLDOWN)
+                print(f"⏳ Brandfetch rate limited {stats['label']}, switching keys")
+            elif response is not None and response.status_code in DISABLING_STATUSES:
+                stats["disabled"] = True
+                print(f"⛔ Brandfetch rejected {stats['label']} (HTTP {response.status_code}), disabling it")
+            self._lock.notify_all()
+
+    def usage(self):
+        """
+        Returns per-key usage counters, labelled without exposing the keys.
+
+        Returns
+        -------
+        list of dict
+            One entry per key with label, requests, rate_limited and disabled.
+        """
+
+        with self._lock:
+            return [
+                {
+                    "label": stats["label"],
+                    "requests": stats["requests"],
+                    "rate_limited": stats["rate_limited"],
+                    "disabled": stats["disabled"],
+                }
+                for stats in self._stats.values()
+            ]
+
+
+_single_key_pools = {}
+_single_key_pools_lock = threading.Lock()
+
+
+def as_key_pool(brand_api_key):
+    """
+    Normalizes the `brand_api_key` accepted across the project into a pool.
+
+    A plain key string gets its own process-wide single-key pool, so its
+    cooldown state survives between lookups.
+    """
+
+    if isinstance(brand_api_key, BrandfetchKeyPool):
+        return brand_api_key
+    with _single_key_pools_lock:
+        if brand_api_key not in _single_key_pools:
+            _single_key_pools[brand_api_key] = BrandfetchKeyPool([brand_api_key])
+        return _single_key_pools[brand_api_key]
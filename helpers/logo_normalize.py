@@ -0,0 +1,115 @@
+import io
+import math
+import os
+import tempfile
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional: without it, original logos are embedded as-is
+    Image = None
+
+EMU_PER_INCH = 914400
+TARGET_DPI = 220  # sharp on screen and in print at the size logos are drawn
+
+# Largest box any template draws a logo into: the wide template's investment
+# columns (2,060,534 EMU) at 90% width, and its buyer rows (945,291 EMU) at 60% height
+MAX_LOGO_BOX_EMU = (int(2060534 * 0.90), int(945291 * 0.60))
+
+# Normalized variants live next to the originals, in a folder named after the settings
+NORMALIZED_DIR = f".normalized_{TARGET_DPI}dpi"
+
+
+def max_logo_box_pixels():
+    """Returns the (width, height) in pixels of the largest logo box at TARGET_DPI."""
+    return tuple(math.ceil(emu / EMU_PER_INCH * TARGET_DPI) for emu in MAX_LOGO_BOX_EMU)
+
+
+def _normalize_logo_bytes(logo_file):
+    """
+    Returns the bytes of the normalized PNG, or of the original file when
+    re-encoding does not make it any smaller.
+    """
+
+    with open(logo_file, "rb") as f:
+        original = f.read()
+
+    im = Image.open(io.BytesIO(original))
+    was_palette = im.mode == "P"
+    has_alpha = im.mode in ("RGBA", "LA") or "transparency" in im.info
+    im = im.convert("RGBA" if has_alpha else "RGB")
+
+    # Trim fully transparent margins so the visible logo fills its box
+    if has_alpha:
+        bbox = im.getchannel("A").getbbox()
+        if bbox:
+            im = im.crop(bbox)
+
+    # Logos are stretched to their box, so keep at least the box's pixel
+    # density along both axes: scale by the larger of the two ratios
+    box_width, box_height = max_logo_box_pixels()
+    scale = max(box_width / im.width, box_height / im.height)
+    if scale < 1:
+        im = im.resize((max(1, round(im.width * scale)), max(1, round(im.height * scale))), Image.LANCZOS)
+
+    if was_palette:
+        im = im.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+
+    out = io.BytesIO()
+    im.save(out, format="PNG", optimize=True)
+    normalized = out.getvalue()
+    return normalized if len(normalized) < len(original) else original
+
+
+def normalized_logo_path(logo_file):
+    """
+    Returns the path of a trimmed, downscaled and recompressed variant of a logo.
+
+    The variant is sized for the largest placement box used by the templates
+    and cached in NORMALIZED_DIR next to the original; it is rebuilt when the
+    original is newer. If Pillow is not installed or the file cannot be
+    decoded, the original path is returned unchanged.
+
+    Parameters
+    ----------
+    logo_file : str
+        Path to the original PNG logo.
+
+    Returns
+    -------
+    str
+        Path to the normalized logo, or `logo_file` itself as a fallback.
+    """
+
+    if Image is None:
+        return logo_file
+
+    logo_dir, logo_name = os.path.split(logo_file)
+    normalized_dir = os.path.join(logo_dir, NORMALIZED_DIR)
+    normalized_file = os.path.join(normalized_dir, logo_name)
+    try:
+        if os.path.getmtime(normalized_file) >= os.path.getmtime(logo_file):
+            return normalized_file
+    except OSError:
+        pass
+
+    try:
+        data = _normalize_logo_bytes(logo_file)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        print(f"⚠️ Could not normalize {logo_file}, using original: {e}")
+        return logo_file
+
+    tmp_file = None
+    try:
+        os.makedirs(normalized_dir, exist_ok=True)
+        # A temp file of its own: sessions share the process, and may normalize the same logo at once
+        fd, tmp_file = tempfile.mkstemp(dir=normalized_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_file, 0o644)  # mkstemp creates files readable by their owner only
+        os.replace(tmp_file, normalized_file)
+    except OSError as e:
+        print(f"⚠️ Could not save normalized {logo_file}, using original: {e}")
+        if tmp_file is not None and os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        return logo_file
+    return normalized_file
@@ -1,6 +1,98 @@
 from pptx import slide, table
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.parts.image import Image, ImagePart
+from helpers.logo_normalize import normalized_logo_path
 
-def place_logo_on_slide(slide, table_shape, table, row_idx, col_idx, logo_file, width_spacing, height_spacing, left_spacing, top_spacing):
+
+class ImagePartCache:
+    """
+    Image parts of one presentation, reused across a whole generation run.
+
+    `slide.shapes.add_picture` re-reads the file, re-hashes it and then scans
+    every part of the package (re-hashing each image) to find a duplicate,
+    on every single call. This cache reads and hashes each logo file once,
+    indexes the presentation's existing images by SHA1 once, and relates
+    the same image part to every slide that shows the logo. New image parts
+    are numbered from a counter instead of another scan of the package, and
+    pictures are always drawn at an explicit size, so the image is never
+    decoded to find its native dimensions.
+
+    Parameters
+    ----------
+    prs : pptx.Presentation
+        The presentation the pictures are added to. The cache must not be
+        shared with another presentation.
+    """
+
+    def __init__(self, prs):
+        self._package = prs.part.package
+        self._parts_by_file = {}
+        parts = list(self._package.iter_parts())
+        self._parts_by_sha1 = {part.sha1: part for part in parts if isinstance(part, ImagePart)}
+        self._next_image_idx = 1 + max(
+            (
+                part.partname.idx for part in parts
+                if part.partname.startswith("/ppt/media/image") and part.partname.idx is not None
+            ),
+            default=0,
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get_image_part(self, image_file):
+        """Returns the image part for `image_file`, loading it on first use."""
+        image_part = self._parts_by_file.get(image_file)
+        if image_part is not None:
+            self.hits += 1
+            return image_part
+
+        self.misses += 1
+        image = Image.from_file(image_file)
+        image_part = self._parts_by_sha1.get(image.sha1)
+        if image_part is None:
+            image_part = self._new_image_part(image.sha1, image.blob, image.content_type, image.ext, image.filename)
+        self._parts_by_file[image_file] = image_part
+        return image_part
+
+    def import_image_part(self, image_part):
+        """
+        Returns this presentation's image part with the same content as
+        `image_part` (an image of another presentation), adding it if missing.
+        """
+
+        sha1 = image_part.sha1
+        own_part = self._parts_by_sha1.get(sha1)
+        if own_part is None:
+            own_part = self._new_image_part(
+                sha1, image_part.blob, image_part.content_type, image_part.partname.ext, image_part._filename
+            )
+        return own_part
+
+    def _new_image_part(self, sha1, blob, content_type, ext, filename):
+        partname = PackURI(f"/ppt/media/image{self._next_image_idx}.{ext}")
+        self._next_image_idx += 1
+        image_part = ImagePart(partname, content_type, self._package, blob, filename)
+        self._parts_by_sha1[sha1] = image_part
+        return image_part
+
+    def add_picture(self, slide, image_file, left, top, width, height):
+        """Same as `slide.shapes.add_picture`, reusing cached image parts."""
+        image_part = self.get_image_part(image_file)
+        rId = slide.part.relate_to(image_part, RT.IMAGE)
+        shapes = slide.shapes
+        shape_id = shapes._next_shape_id
+        pic = shapes._grpSp.add_pic(
+            shape_id, f"Picture {shape_id - 1}", image_part.desc, rId, left, top, width, height
+        )
+        return shapes._shape_factory(pic)
+
+    def stats(self):
+        """Returns hit/miss counts and the number of distinct images loaded."""
+        return {"hits": self.hits, "misses": self.misses, "images": len(self._parts_by_file)}
+
+
+def place_logo_on_slide(slide, table_shape, table, row_idx, col_idx, logo_file, width_spacing, height_spacing, left_spacing, top_spacing, image_cache=None, geometry=None):
     """
     Places the logo image on the slide, anchored visually aligned to the table cell
     at (row_idx, col_idx) with a slight downward offset for balanced look.
@@ -15,16 +107,26 @@ def place_logo_on_slide(slide, table_shape, table, row_idx, col_idx, logo_file,
     row_idx : int
     col_idx : int
     logo_file : str
-        Path to the PNG file to insert.
+        Path to the PNG file to insert. Its normalized variant (trimmed and
+        downscaled to the placement size) is embedded when available.
     width_spacing : float
     height_spacing : float
     left_spacing : float
     top_spacing : float
+    image_cache : ImagePartCache, optional
+        Run-scoped image cache of the presentation; without it every call
+        reads and hashes the file again.
+    geometry : TableGeometry, optional
+        Precomputed cell offsets of the template the table was copied from;
+        without it the offsets are summed from the table on every call.
     """
-    left = table_shape.left + sum([table.columns[i].width for i in range(col_idx)])
-    top = table_shape.top + sum([table.rows[j].height for j in range(row_idx)])
-    width = table.columns[col_idx].width
-    height = table.rows[row_idx].height
+    if geometry is not None:
+        left, top, width, height = geometry.cell_box(row_idx, col_idx)
+    else:
+        left = table_shape.left + sum([table.columns[i].width for i in range(col_idx)])
+        top = table_shape.top + sum([table.rows[j].height for j in range(row_idx)])
+        width = table.columns[col_idx].width
+        height = table.rows[row_idx].height
 
     # Slight inset and slight downward offset to look good even with multi-line text
     img_width = int(width * width_spacing)
@@ -32,4 +134,8 @@ def place_logo_on_slide(slide, table_shape, table, row_idx, col_idx, logo_file,
     img_left = left + int(width * left_spacing)
     img_top = top + int(height * top_spacing)  # slightly lower for balanced look
 
-    slide.shapes.add_picture(logo_file, img_left, img_top, img_width, img_height)
+    logo_file = normalized_logo_path(logo_file)
+    if image_cache is not None:
+        image_cache.add_picture(slide, logo_file, img_left, img_top, img_width, img_height)
+    else:
+        slide.shapes.add_picture(logo_file, img_left, img_top, img_width, img_height)
@@ -1,15 +1,33 @@
+import contextvars
 import os
-from helpers.brandfetcher import get_brandfetch_logo, download_logo_file
+from concurrent.futures import ThreadPoolExecutor
+from helpers.brandfetcher import lookup_brandfetch_logo, download_logo_file
+from helpers.negative_cache import get_negative_cache
+from helpers.run_report import count, span
 from path_helpers import get_base_path
 
 BASE_PATH = get_base_path()
 
-def ensure_logo_available(logo_name, domain, brand_api_key, logo_base_dir="logos"):
+# (logo file column, website column) pairs rendered by every strip layout
+LOGO_COLUMNS = [
+    ("logo_file", "website"),
+    ("investment1_logofile", "investment1_website"),
+    ("investment2_logofile", "investment2_website"),
+    ("investment3_logofile", "investment3_website"),
+]
+
+LOGO_PREFETCH_WORKERS = 8
+
+def ensure_logo_available(logo_name, domain, brand_api_key, logo_base_dir="logos", force_refresh=False, cancel_event=None):
     """
     Checks if the logo PNG exists in the local logos folder.
     If not, attempts to fetch it from Brandfetch using the domain
     and saves it under logo_name.
 
+    Domains Brandfetch recently answered without a PNG logo are kept in
+    a persisted negative cache and skipped without any network call,
+    unless `force_refresh` is set.
+
     Parameters
     ----------
     logo_name : str
@@ -21,6 +39,12 @@ def ensure_logo_available(logo_name, domain, brand_api_key, logo_base_dir="logos
     logo_base_dir : str
         Directory where logo PNG files are stored.
 
+    force_refresh : bool
+        Ask Brandfetch again even if the domain is cached as a known miss.
+
+    cancel_event : threading.Event, optional
+        Once set, Brandfetch calls stop retrying and waiting for keys.
+
     Returns
     -------
     str or None
@@ -30,15 +54,28 @@ def ensure_logo_available(logo_name, domain, brand_api_key, logo_base_dir="logos
     logo_dir = os.path.join(BASE_PATH, logo_base_dir)
     logo_file = os.path.join(logo_dir, f"{logo_name}.png")
     if os.path.exists(logo_file):
+        count("logo_file_hits")
         return logo_file
     else:
+        negative_cache = get_negative_cache()
+        if not force_refresh and negative_cache.is_known_miss(domain):
+            count("logo_negative_cache_hits")
+            return None
+
         print(f"🔍 Attempting to fetch logo for {domain} to save as {logo_name}")
-        logo_url = get_brandfetch_logo(domain, BRANDFETCH_API_KEY=brand_api_key)
+        count("brandfetch_lookups")
+        with span("logo_lookup"):
+            logo_url, definitive = lookup_brandfetch_logo(domain, BRANDFETCH_API_KEY=brand_api_key, cancel_event=cancel_event)
         if logo_url:
-            download_logo_file(logo_url, logo_name, save_dir=logo_dir)
+            count("logo_downloads")
+            with span("logo_download"):
+                download_logo_file(logo_url, logo_name, save_dir=logo_dir, cancel_event=cancel_event)
             if os.path.exists(logo_file):
                 print(f"✅ Successfully fetched and saved logo for {domain}")
+                negative_cache.forget(domain)
                 return logo_file
+        elif definitive:
+            negative_cache.record_miss(domain, reason="no png logo")
         print(f"❌ Could not obtain logo for {domain}")
         return None
     
@@ -92,7 +129,7 @@ def get_logo_file_path(row, logo_name_column, domain_column, brand_api_key, logo
     return ensure_logo_available(logo_name, domain, brand_api_key=brand_api_key, logo_base_dir=logo_base_dir)
 
 
-def get_lincoln_file_path(logo_name, brand_api_key, logo_base_dir="linc_logos"):
+def get_lincoln_file_path(logo_name, brand_api_key, logo_base_dir="linc_logos", cancel_event=None):
     """
     Given a DataFrame row with expected columns for logo name and domain,
     returns the full path to the logo file, ensuring it exists (or fetched).
@@ -113,4 +150,119 @@ def get_lincoln_file_path(logo_name, brand_api_key, logo_base_dir="linc_logos"):
 
     domain = "www.lincolninternational.com" # your 7th column for website domain
 
-    return ensure_logo_available(logo_name, domain, brand_api_key=brand_api_key, logo_base_dir=logo_base_dir)
\ No newline at end of file
+    return ensure_logo_available(logo_name, domain, brand_api_key=brand_api_key, logo_base_dir=logo_base_dir,
+                                 cancel_event=cancel_event)
+
+
+def needs_lincoln_logo(df):
+    """Returns True if a buyer of `df` is advised by Lincoln, and so shows the Lincoln favicon."""
+    return "linc_advised" in df.columns and bool((df["linc_advised"].map(str) == "Yes").any())
+
+
+def find_local_logo(logo_name, logo_base_dir="logos"):
+    """
+    Returns the full path of a logo already in the logos folder, or None.
+
+    Unlike `ensure_logo_available`, never calls Brandfetch: renderers use it
+    for logos that were not resolved ahead of time.
+    """
+
+    logo_file = os.path.join(BASE_PATH, logo_base_dir, f"{logo_name}.png")
+    return logo_file if os.path.exists(logo_file) else None
+
+
+def collect_logo_requests(df):
+    """
+    Collects every unique logo referenced by the buyers DataFrame.
+
+    Mirrors the lookups done while rendering (`str()` of the logo file and
+    website columns), so the prefetch resolves exactly the files the
+    templates will ask for. When the same logo file appears with several
+    websites, the first one wins, as it would during a serial render.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The full DataFrame of buyers data.
+
+    Returns
+    -------
+    dict
+        Mapping of logo name (without .png) to the domain used to fetch it.
+    """
+
+    logo_requests = {}
+    for logo_name_column, domain_column in LOGO_COLUMNS:
+        if logo_name_column not in df.columns or domain_column not in df.columns:
+            continue
+        for logo_name, domain in zip(df[logo_name_column].map(str), df[domain_column].map(str)):
+            logo_requests.setdefault(logo_name, domain)
+    return logo_requests
+
+
+def prefetch_logos(df, brand_api_key, logo_base_dir="logos", max_workers=LOGO_PREFETCH_WORKERS, force_refresh=False):
+    """
+    Resolves every logo missing from the local logos folder before rendering.
+
+    Unique logos are collected for the whole DataFrame and the missing ones
+    are fetched from Brandfetch on a bounded thread pool, so slide rendering
+    only ever finds files already on disk instead of waiting on serial
+    HTTP round trips row by row.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The full DataFrame of buyers data.
+
+    logo_base_dir : str
+        Directory where logo PNG files are stored.
+
+    max_workers : int
+        Maximum number of concurrent Brandfetch lookups/downloads.
+
+    force_refresh : bool
+        Re-check domains cached as known Brandfetch misses.
+
+    Returns
+    -------
+    dict
+        Mapping of logo name to the full path of the logo file, or None if
+        unavailable, including 'linc_favi' when a buyer is advised by Lincoln.
+        Pass it to the renderers as `logo_files`.
+    """
+
+    logo_dir = os.path.join(BASE_PATH, logo_base_dir)
+    logo_requests = collect_logo_requests(df)
+    resolved = {}
+    missing = {}
+    for logo_name, domain in logo_requests.items():
+        logo_file = os.path.join(logo_dir, f"{logo_name}.png")
+        if os.path.exists(logo_file):
+            count("logo_file_hits")
+            resolved[logo_name] = logo_file
+        else:
+            missing[logo_name] = domain
+
+    if needs_lincoln_logo(df):
+        # Favicon lives in its own folder; resolve it up front like any other logo
+        resolved["linc_favi"] = get_lincoln_file_path(logo_name="linc_favi", brand_api_key=brand_api_key)
+
+    if not missing:
+        return resolved
+
+    print(f"🔍 Prefetching {len(missing)} missing logos of {len(logo_requests)} referenced...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Each lookup runs in a copy of this context, so it reports to the current run report
+        futures = {
+            logo_name: executor.submit(
+                contextvars.copy_context().run, ensure_logo_available, logo_name, domain, brand_api_key=brand_api_key,
+                logo_base_dir=logo_base_dir, force_refresh=force_refresh
+            )
+            for logo_name, domain in missing.items()
+        }
+        for logo_name, future in futures.items():
+            resolved[logo_name] = future.result()
+
+    fetched = sum(1 for logo_name in missing if resolved[logo_name])
+    print(f"✅ Prefetched {fetched} of {len(missing)} missing logos.")
+    return resolved
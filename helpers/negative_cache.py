@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import threading
+import time
+from path_helpers import get_cache_dir
+
+NEGATIVE_CACHE_FILE = "brandfetch_misses.sqlite3"
+NEGATIVE_CACHE_TTL = 30 * 24 * 3600  # re-check unresolved domains after 30 days
+
+
+class NegativeLogoCache:
+    """
+    Persisted record of domains Brandfetch could not resolve to a PNG logo.
+
+    Entries expire after `ttl` seconds so that companies which publish a
+    logo later are eventually picked up again. Only definitive misses
+    (Brandfetch answered, but has no PNG logo) belong here; network errors,
+    rate limits and key problems must not be recorded.
+
+    Misses are stored in SQLite, one row per domain, like the translation
+    cache: each miss recorded or forgotten upserts or deletes its own row,
+    so several processes sharing the cache folder neither drop each
+    other's entries nor restore ones another forgot.
+
+    Parameters
+    ----------
+    path : str
+        SQLite database file, created if missing.
+
+    ttl : float
+        Time-to-live of a miss, in seconds.
+    """
+
+    def __init__(self, path, ttl=NEGATIVE_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS misses (
+                    domain TEXT PRIMARY KEY,
+                    checked_at REAL NOT NULL,
+                    reason TEXT NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def _key(domain):
+        return str(domain).strip().lower()
+
+    def is_known_miss(self, domain):
+        """Returns True if `domain` failed recently enough to skip the network call."""
+        with self._lock:
+            row = self._conn.execute("SELECT checked_at FROM misses WHERE domain = ?", (self._key(domain),)).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl
+
+    def record_miss(self, domain, reason):
+        """Stores a definitive miss for `domain`."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO misses (domain, checked_at, reason) VALUES (?, ?, ?)",
+                (self._key(domain), time.time(), reason),
+            )
+
+    def forget(self, domain):
+        """Drops `domain` so the next lookup goes to Brandfetch again."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM misses WHERE domain = ?", (self._key(domain),))
+
+    def clear(self):
+        """Drops every recorded miss, forcing all domains to be re-checked."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM misses")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM misses").fetchone()[0]
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_negative_cache():
+    """Returns the process-wide negative cache stored in the cache folder."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = NegativeLogoCache(os.path.join(get_cache_dir(), NEGATIVE_CACHE_FILE))
+    return _default_cache
@@ -0,0 +1,148 @@
+import contextvars
+import queue
+import threading
+
+# Seconds between checks for a cancellation while waiting on network work
+CANCEL_POLL_INTERVAL = 0.2
+
+
+class RunCancelled(Exception):
+    """Raised inside a run once its RunControl is cancelled."""
+
+
+class ProgressEvent:
+    """
+    Progress of one stage of a run.
+
+    Parameters
+    ----------
+    stage : str
+        'logos' (Brandfetch lookups and downloads), 'translations',
+        'slides', 'writing' (slides written to the output file) or 'done'.
+    done : int
+    total : int
+    message : str
+        Human readable description, e.g. 'Creating slide 3 of 40'.
+    """
+
+    def __init__(self, stage, done, total, message=""):
+        self.stage = stage
+        self.done = done
+        self.total = total
+        self.message = message
+
+    @property
+    def fraction(self):
+        """Share of the stage completed, from 0.0 to 1.0."""
+        return min(self.done / self.total, 1.0) if self.total else 1.0
+
+    def __repr__(self):
+        return f"ProgressEvent({self.stage!r}, {self.done}, {self.total}, {self.message!r})"
+
+
+class RunControl:
+    """
+    Carries progress reporting and cancellation through a run.
+
+    Long-running functions accept an optional `control`: they call `report`
+    as stages advance and `check` between units of work, which raises
+    RunCancelled once `cancel` has been called from any thread.
+
+    Parameters
+    ----------
+    on_progress : callable, optional
+        Called with every ProgressEvent, from the thread doing the work.
+    """
+
+    def __init__(self, on_progress=None):
+        self.on_progress = on_progress
+        self._cancelled = threading.Event()
+
+    def report(self, stage, done, total, message=""):
+        if self.on_progress is not None:
+            self.on_progress(ProgressEvent(stage, done, total, message))
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def cancel_event(self):
+        """threading.Event set on cancellation, for code that waits (retry backoff, key cooldowns)."""
+        return self._cancelled
+
+    def check(self):
+        """Raises RunCancelled if the run was cancelled."""
+        if self._cancelled.is_set():
+            raise RunCancelled("Run cancelled")
+
+    def within(self, offset, total):
+        """
+        Returns a control for one part of a larger run: its slide counts are
+        shifted by `offset` slides out of `total`, and cancelling either
+        control cancels both.
+        """
+        return _PartControl(self, offset, total)
+
+
+class _PartControl(RunControl):
+
+    def __init__(self, parent, offset, total):
+        super().__init__()
+        self._parent = parent
+        self._cancelled = parent._cancelled
+        self._offset = offset
+        self._total = total
+
+    def report(self, stage, done, total, message=""):
+        if stage == "slides":
+            done, total = done + self._offset, self._total
+            message = f"Creating slide {done} of {total}"
+        self._parent.report(stage, done, total, message)
+
+
+def iter_progress(run, *args, **kwargs):
+    """
+    Runs `run(*args, control=..., **kwargs)` on a background thread and
+    yields its ProgressEvents as they happen.
+
+    The last event has stage 'done' and carries the run's return value in
+    `done` when it is an int. Exceptions of the run are raised here.
+    Closing the generator early (break, or the consumer being interrupted)
+    cancels the run: nothing new is started, and network calls already in
+    flight finish in the background.
+    """
+
+    events = queue.Queue()
+    control = RunControl(on_progress=events.put)
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = run(*args, control=control, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            events.put(None)
+
+    # The run sees this thread's context, so it reports to the current run report
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(target,), daemon=True)
+    thread.start()
+    try:
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            yield event
+    finally:
+        if thread.is_alive():
+            control.cancel()
+
+    if "error" in outcome:
+        raise outcome["error"]
+    result = outcome.get("result")
+    count = result if isinstance(result, int) else 0
+    yield ProgressEvent("done", count, count, "Finished")
@@ -0,0 +1,156 @@
+import contextvars
+import json
+import threading
+import time
+
+_current_report = contextvars.ContextVar("run_report", default=None)
+
+
+class RunReport:
+    """
+    Timings and counters of one run, aggregated per stage and per slide.
+
+    Code throughout the run marks its stages with `span` and its network
+    calls and cache hits with `count`; both record into the report made
+    current with `activate`, and do nothing when there is none. The
+    report follows the run into asyncio tasks and `asyncio.to_thread`
+    calls; other threads must be started in a copy of the context
+    (`contextvars.copy_context().run`). Work done in other processes is
+    not recorded.
+
+    Stage times are summed over every span, so stages running concurrently
+    (logo lookups, translations) can add up to more than the run's wall time.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._slides = {}
+        self._counters = {}
+
+    def add_span(self, stage, seconds, slide=None):
+        with self._lock:
+            totals = self._stages.setdefault(stage, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+            totals["count"] += 1
+            totals["seconds"] += seconds
+            totals["max_seconds"] = max(totals["max_seconds"], seconds)
+            if slide is not None:
+                slide_stages = self._slides.setdefault(slide, {})
+                slide_stages[stage] = slide_stages.get(stage, 0.0) + seconds
+
+    def add_count(self, counter, n=1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + n
+
+    def activate(self):
+        """Makes this the current report for the duration of a `with` block."""
+        return _Activation(self)
+
+    def to_dict(self):
+        """
+        Returns the report as plain data:
+
+        - total_seconds: wall time since the report was created
+        - stages: {stage: {count, seconds, max_seconds}}, slowest first
+        - slides: [{first_buyer, seconds, stages: {stage: seconds}}], in deck order
+        - counters: {name: count}
+        """
+
+        with self._lock:
+            stages = sorted(self._stages.items(), key=lambda item: item[1]["seconds"], reverse=True)
+            return {
+                "started": self.started,
+                "total_seconds": round(time.perf_counter() - self._start, 4),
+                "stages": {
+                    stage: {
+                        "count": totals["count"],
+                        "seconds": round(totals["seconds"], 4),
+                        "max_seconds": round(totals["max_seconds"], 4),
+                    }
+                    for stage, totals in stages
+                },
+                "slides": [
+                    {
+                        "first_buyer": first_buyer,
+                        "seconds": round(sum(slide_stages.values()), 4),
+                        "stages": {stage: round(seconds, 4) for stage, seconds in slide_stages.items()},
+                    }
+                    for first_buyer, slide_stages in sorted(self._slides.items())
+                ],
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+
+class _Activation:
+
+    def __init__(self, report):
+        self.report = report
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_report.set(self.report)
+        return self.report
+
+    def __exit__(self, *exc_info):
+        _current_report.reset(self._token)
+
+
+class _Span:
+
+    __slots__ = ("stage", "slide", "_report", "_start")
+
+    def __init__(self, stage, slide):
+        self.stage = stage
+        self.slide = slide
+
+    def __enter__(self):
+        self._report = _current_report.get()
+        if self._report is not None:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._report is not None:
+            self._report.add_span(self.stage, time.perf_counter() - self._start, self.slide)
+
+
+def span(stage, slide=None):
+    """
+    Times a `with` block as one occurrence of `stage` in the current report.
+
+    Parameters
+    ----------
+    stage : str
+        e.g. 'ingest', 'template_load', 'table_copy', 'cell_writes',
+        'logo_lookup', 'logo_download', 'translation', 'picture_insert', 'save'.
+    slide : int, optional
+        Number of the first buyer of the slide being built, to also add the
+        time to that slide.
+
+    Examples
+    --------
+    >>> with span("table_copy", slide=6):
+    ...     copy_table_from_template_slide(prs, 1, slide)
+    """
+    return _Span(stage, slide)
+
+
+def count(counter, n=1):
+    """Adds `n` to a counter of the current report, e.g. count('brandfetch_calls')."""
+    report = _current_report.get()
+    if report is not None:
+        report.add_count(counter, n)
+
+
+def current_report():
+    """Returns the current RunReport, or None."""
+    return _current_report.get()
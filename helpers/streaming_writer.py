@@ -0,0 +1,137 @@
+import io
+import zipfile
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import Part
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.parts.image import ImagePart
+from helpers.run_report import span
+
+
+class StreamingDeckWriter:
+    """
+    Writes a deck into a .pptx file on disk while its slides are being generated.
+
+    Slides are rendered in batches, each into a fresh Presentation of the
+    template (`new_presentation`); `append_slides` then writes the batch's
+    slides and any image not written yet straight into the output zip, and
+    the batch can be dropped. Only the template's own parts stay in memory,
+    with one small placeholder per written slide and image, so memory is
+    bounded by the batch size rather than by the length of the deck.
+    `close` writes the template parts, the presentation part listing every
+    slide and the content types.
+
+    Parameters
+    ----------
+    template_blob : bytes
+        The template presentation, as saved .pptx bytes.
+
+    output_file : str or file-like
+        Where to write the deck.
+    """
+
+    def __init__(self, template_blob, output_file):
+        self._template_blob = template_blob
+        self._prs = Presentation(io.BytesIO(template_blob))
+        self._package = self._prs.part.package
+        self._zip = zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED)
+
+        parts = list(self._package.iter_parts())
+        self._template_partnames = {part.partname for part in parts}
+        self._media_by_sha1 = {part.sha1: part.partname for part in parts if isinstance(part, ImagePart)}
+        self._next_slide_idx = 1 + max(
+            (part.partname.idx for part in parts if part.partname.startswith("/ppt/slides/slide")), default=0
+        )
+        self._next_image_idx = 1 + max(
+            (
+                part.partname.idx for part in parts
+                if part.partname.startswith("/ppt/media/image") and part.partname.idx is not None
+            ),
+            default=0,
+        )
+        self._written_parts = []
+        self.slides_written = 0
+
+    def new_presentation(self):
+        """Returns a fresh copy of the template to render the next batch of slides into."""
+        return Presentation(io.BytesIO(self._template_blob))
+
+    def append_slides(self, batch_prs, first_slide_idx):
+        """
+        Writes the slides of `batch_prs` from `first_slide_idx` on to the
+        output, after the slides already written.
+
+        Raises
+        ------
+        ValueError
+            If a slide relates to parts other than its layout and images.
+        """
+
+        with span("save"):
+            self._append_slides(batch_prs, first_slide_idx)
+
+    def _append_slides(self, batch_prs, first_slide_idx):
+        for slide in list(batch_prs.slides)[first_slide_idx:]:
+            slide_part = slide.part
+            for rel in slide_part.rels.values():
+                if rel.is_external or rel.reltype == RT.SLIDE_LAYOUT:
+                    continue
+                if rel.reltype != RT.IMAGE:
+                    raise ValueError(f"Cannot stream a slide related to {rel.reltype}")
+                image_part = rel.target_part
+                if image_part.partname not in self._template_partnames:
+                    # Renaming the batch's part points the slide's rels at the output's copy
+                    image_part.partname = self._write_image(image_part)
+
+            # Layouts keep their partnames: every batch comes from the same template
+            slide_part.partname = PackURI(f"/ppt/slides/slide{self._next_slide_idx}.xml")
+            self._next_slide_idx += 1
+            self._write(slide_part)
+            placeholder = self._placeholder(slide_part)
+            self._prs.slides._sldIdLst.add_sldId(self._prs.part.relate_to(placeholder, RT.SLIDE))
+            self.slides_written += 1
+
+    def _write_image(self, image_part):
+        partname = self._media_by_sha1.get(image_part.sha1)
+        if partname is None:
+            partname = PackURI(f"/ppt/media/image{self._next_image_idx}.{image_part.partname.ext}")
+            self._next_image_idx += 1
+            self._media_by_sha1[image_part.sha1] = partname
+            self._zip.writestr(partname.membername, image_part.blob)
+            self._placeholder(image_part, partname)
+        return partname
+
+    def _write(self, part):
+        self._zip.writestr(part.partname.membername, part.blob)
+        if part._rels:
+            self._zip.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+    def _placeholder(self, part, partname=None):
+        # Stands in for a written part: listed in the content types and, for
+        # slides, related from the presentation part, but never written again
+        placeholder = Part(partname or part.partname, part.content_type, self._package)
+        self._written_parts.append(placeholder)
+        return placeholder
+
+    def discard(self):
+        """Closes the output file without completing it, after a failed or cancelled run."""
+        self._zip.close()
+
+    def close(self):
+        """Writes the rest of the package and closes the output file."""
+        with span("save"):
+            self._close()
+
+    def _close(self):
+        written = {part.partname for part in self._written_parts}
+        parts = [part for part in self._package.iter_parts() if part.partname not in written]
+        for part in parts:
+            self._write(part)
+        self._zip.writestr(
+            CONTENT_TYPES_URI.membername,
+            serialize_part_xml(_ContentTypesItem.xml_for(parts + self._written_parts)),
+        )
+        self._zip.writestr(PACKAGE_URI.rels_uri.membername, self._package._rels.xml)
+        self._zip.close()
@@ -0,0 +1,207 @@
+from pptx.dml.color import RGBColor
+from helpers.buyers_frame import buyer_records, source_columns
+from helpers.cell_writer import CompiledTableWriter
+from helpers.copy_helpers import copy_table_from_template_slide
+from helpers.logo_resources import find_local_logo
+from helpers.logo_placement import place_logo_on_slide
+from helpers.run_report import span
+from helpers.template_tables import get_template_table
+from translate_helpers import lookup_translation
+
+CHECK_MARK = "\u2713"  # ✓
+CROSS_MARK = "\u2718"  # ✘
+
+# BR presence mark and its color, by value of the brazil_investments column;
+# any other value leaves the template's placeholder in the cell
+BR_PRESENCE_MARKS = {
+    "Yes": (CHECK_MARK, RGBColor(0, 168, 126)),
+    "No": (CROSS_MARK, RGBColor(192, 0, 0)),
+}
+
+
+class TextColumn:
+    """
+    A table column showing one field as text.
+
+    Parameters
+    ----------
+    col_idx : int
+    field : str
+        Column of the prepared buyers frame to show (see `prepare_buyers_frame`),
+        or 'number' for the buyer's running number.
+    translate : bool
+        Show the field's translation (see `lookup_translation`).
+    remove_trailing : bool
+        Remove the template's paragraphs after the written one.
+    """
+
+    def __init__(self, col_idx, field, translate=False, remove_trailing=True):
+        self.col_idx = col_idx
+        self.field = field
+        self.translate = translate
+        self.remove_trailing = remove_trailing
+
+
+class MarkColumn:
+    """A table column showing a colored mark chosen by a field's value (see BR_PRESENCE_MARKS)."""
+
+    def __init__(self, col_idx, field, marks=BR_PRESENCE_MARKS):
+        self.col_idx = col_idx
+        self.field = field
+        self.marks = marks
+
+
+class LogoColumn:
+    """
+    A logo drawn over a table column.
+
+    Parameters
+    ----------
+    col_idx : int
+    logo_columns : (str, str) or None
+        (logo file column, website column) of the logo, or None for the
+        Lincoln favicon.
+    spacings : dict
+        width/height/left/top spacing, as fractions of the cell (see `place_logo_on_slide`).
+    only_if : str, optional
+        Boolean column of the prepared buyers frame that must be set for
+        the logo to be drawn.
+    """
+
+    def __init__(self, col_idx, logo_columns, spacings, only_if=None):
+        self.col_idx = col_idx
+        self.logo_columns = logo_columns
+        self.spacings = spacings
+        self.only_if = only_if
+
+
+COMPANY_LOGO_SPACINGS = dict(width_spacing=0.90, height_spacing=0.60, left_spacing=0.03, top_spacing=0.18)
+INVESTMENT_LOGO_SPACINGS = dict(width_spacing=0.90, height_spacing=0.50, left_spacing=0.03, top_spacing=0.18)
+FAVICON_SPACINGS = dict(width_spacing=0.2, height_spacing=0.3, left_spacing=0.90, top_spacing=0.1)
+
+# Logos of every strip layout, in drawing order
+STRIP_LOGOS = [
+    LogoColumn(1, ("logo_file", "website"), COMPANY_LOGO_SPACINGS),
+    LogoColumn(5, ("investment1_logofile", "investment1_website"), INVESTMENT_LOGO_SPACINGS),
+    LogoColumn(6, ("investment2_logofile", "investment2_website"), INVESTMENT_LOGO_SPACINGS),
+    LogoColumn(7, ("investment3_logofile", "investment3_website"), INVESTMENT_LOGO_SPACINGS),
+    # Favicon of investors advised by Lincoln, top right of the company cell
+    LogoColumn(1, None, FAVICON_SPACINGS, only_if="is_linc_advised"),
+]
+
+
+class StripLayout:
+    """
+    Declarative description of a buyers strip layout.
+
+    Parameters
+    ----------
+    source_slide_idx : int
+        Slide of the template presentation holding the layout's table.
+    columns : list of TextColumn / MarkColumn
+        What each table column shows, filled in this order.
+    logos : list of LogoColumn
+        Logos drawn over the table, in this order.
+    """
+
+    def __init__(self, source_slide_idx, columns, logos=STRIP_LOGOS):
+        self.source_slide_idx = source_slide_idx
+        self.columns = columns
+        self.logos = logos
+
+    def source_columns(self):
+        """Columns of the buyers data this layout reads (see `source_columns`)."""
+        fields = [column.field for column in self.columns if column.field != "number"]
+        for logo in self.logos:
+            if logo.logo_columns is not None:
+                fields.extend(logo.logo_columns)
+            if logo.only_if is not None:
+                fields.append(logo.only_if)
+        return source_columns(fields)
+
+
+def render_strip_slide(prs, layout, layout_index, buyers_chunk_df, start_number, brand_api_key, translations=None, image_cache=None,
+                       logo_files=None):
+    """
+    Adds a slide with the given slide layout and fills a copy of the strip
+    layout's template table with a chunk of buyers.
+
+    Cells are written through the template table's compiled slots (see
+    `CompiledTableWriter`), so every layout shares the same fast path.
+
+    Parameters
+    ----------
+    prs : pptx.Presentation
+        The loaded Presentation object.
+
+    layout : StripLayout
+        Columns and logos to render.
+
+    layout_index : int
+        Index of the slide master layout (e.g. 1).
+
+    buyers_chunk_df : pd.DataFrame
+        A slice of the DataFrame, typically up to 5 rows, ideally of the
+        frame returned by `prepare_buyers_frame` (raw slices are prepared here).
+
+    start_number : int
+        Running number of the chunk's first buyer.
+
+    translations : dict, optional
+        Prebuilt table of source text to translation for translated columns.
+
+    image_cache : ImagePartCache, optional
+        Run-scoped image cache shared by every slide of the presentation.
+
+    logo_files : dict, optional
+        Logos resolved ahead of rendering, as logo name to file path or None
+        (see `prefetch_logos`). Logos missing from it are drawn only if
+        already on disk: rendering never calls Brandfetch.
+    """
+
+    with span("slide_add", slide=start_number):
+        slide = prs.slides.add_slide(prs.slide_layouts[layout_index])
+
+    with span("table_copy", slide=start_number):
+        table_shape = copy_table_from_template_slide(prs, source_slide_idx=layout.source_slide_idx, target_slide=slide)
+    table = table_shape.table
+    template_table = get_template_table(prs, source_slide_idx=layout.source_slide_idx)
+    writer = CompiledTableWriter(table_shape, template_table.slots)
+    # Cell offsets are identical on every slide copied from this template table
+    geometry = template_table.geometry
+
+    for i, row in enumerate(buyer_records(buyers_chunk_df)):
+        row_idx = i + 1
+        with span("cell_writes", slide=start_number):
+            for column in layout.columns:
+                if isinstance(column, MarkColumn):
+                    mark = column.marks.get(row[column.field])
+                    if mark is not None:
+                        writer.write_mark(row_idx, column.col_idx, *mark)
+                    continue
+
+                if column.field == "number":
+                    text = str(start_number + i)
+                else:
+                    text = row[column.field]
+                    if column.translate:
+                        text = lookup_translation(text, translations)
+                writer.write_text(row_idx, column.col_idx, text, remove_trailing=column.remove_trailing)
+
+        for logo in layout.logos:
+            if logo.only_if is not None and not row[logo.only_if]:
+                continue
+            if logo.logo_columns is None:
+                logo_name, logo_base_dir = "linc_favi", "linc_logos"
+            else:
+                logo_name, logo_base_dir = str(row[logo.logo_columns[0]]), "logos"
+            if logo_files is not None and logo_name in logo_files:
+                logo_file = logo_files[logo_name]
+            else:
+                logo_file = find_local_logo(logo_name, logo_base_dir)
+            if logo_file:
+                with span("picture_insert", slide=start_number):
+                    place_logo_on_slide(slide, table_shape, table, row_idx, logo.col_idx, logo_file,
+                                        **logo.spacings, image_cache=image_cache, geometry=geometry)
+
+    return slide
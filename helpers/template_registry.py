@@ -0,0 +1,88 @@
+import io
+import os
+import threading
+from pptx import Presentation
+from path_helpers import get_base_path
+from helpers.run_report import span
+from helpers.template_tables import forget_template_file, register_template_file
+
+# Template files shipped with the tool, by short name
+TEMPLATE_FILES = {
+    "standard": "financials_templates.pptx",
+    "wide": "financials_templates_wide.pptx",
+}
+
+_template_blobs = {}  # template file -> (mtime, bytes)
+_template_layouts = {}  # template file -> (mtime, [(index, name), ...])
+_lock = threading.Lock()
+
+
+def _template_path(template_file):
+    return os.path.join(get_base_path(), TEMPLATE_FILES.get(template_file, template_file))
+
+
+def get_template_bytes(template_file):
+    """
+    Returns the contents of a template file, read from disk on first use only.
+
+    The file is read again if it changed on disk since it was cached, and
+    the template tables cached for it are dropped.
+
+    Parameters
+    ----------
+    template_file : str
+        Template file name (e.g. 'financials_templates_wide.pptx') or short
+        name from TEMPLATE_FILES (e.g. 'wide').
+    """
+
+    path = _template_path(template_file)
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _template_blobs.get(path)
+        if cached is None or cached[0] != mtime:
+            if cached is not None:
+                # Tables cached from the previous version must not be stamped into new decks
+                forget_template_file(TEMPLATE_FILES.get(template_file, template_file))
+            with open(path, "rb") as f:
+                cached = _template_blobs[path] = (mtime, f.read())
+    return cached[1]
+
+
+def load_template(template_file):
+    """
+    Returns a new Presentation of a template, parsed from the cached template bytes.
+
+    Every call returns an independent presentation, registered with
+    `register_template_file` so all of them share one set of cached
+    template tables.
+
+    Parameters
+    ----------
+    template_file : str
+        Template file name or short name from TEMPLATE_FILES.
+    """
+
+    with span("template_load"):
+        prs = Presentation(io.BytesIO(get_template_bytes(template_file)))
+    register_template_file(prs, TEMPLATE_FILES.get(template_file, template_file))
+    return prs
+
+
+def get_template_layouts(template_file):
+    """
+    Returns the slide layouts of a template as a list of (index, name).
+
+    Computed on first request and cached with the template bytes.
+    """
+
+    path = _template_path(template_file)
+    blob = get_template_bytes(template_file)
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _template_layouts.get(path)
+    if cached is None or cached[0] != mtime:
+        prs = Presentation(io.BytesIO(blob))
+        cached = (mtime, [(i, layout.name) for i, layout in enumerate(prs.slide_layouts)])
+        with _lock:
+            _template_layouts[path] = cached
+    return list(cached[1])
@@ -0,0 +1,151 @@
+import weakref
+from copy import deepcopy
+from itertools import accumulate
+from helpers.cell_writer import compile_cell_slots
+
+# Template file each loaded presentation came from, when known
+_template_files = weakref.WeakKeyDictionary()  # PresentationPart -> template file name
+
+# Cached template tables: by (template file, slide index) for registered
+# templates, and per presentation for presentations of unknown origin
+_tables_by_file = {}
+_tables_by_presentation = weakref.WeakKeyDictionary()  # PresentationPart -> {slide index: TemplateTable}
+
+
+def register_template_file(prs, template_file):
+    """
+    Records which template file `prs` was loaded from, so that every
+    presentation loaded from the same file shares one set of cached tables.
+
+    Parameters
+    ----------
+    prs : pptx.Presentation
+        A presentation freshly loaded from `template_file`.
+
+    template_file : str
+        Template file name, e.g. 'financials_templates_wide.pptx'.
+    """
+
+    _template_files[prs.part] = template_file
+
+
+def forget_template_file(template_file):
+    """
+    Drops the cached tables of a template file, e.g. after it changed on
+    disk; they are built again from the next presentation that needs them.
+    """
+
+    for key in [key for key in _tables_by_file if key[0] == template_file]:
+        _tables_by_file.pop(key, None)
+
+
+def get_registered_template_file(prs):
+    """Returns the template file `prs` was registered with, or None."""
+    return _template_files.get(prs.part)
+
+
+class TableGeometry:
+    """
+    Absolute position and size of every cell of a template table.
+
+    Tables copied from the same template slide share the template's
+    position and column/row sizes, so cumulative offsets are computed once
+    and reused for every logo placed on every generated slide.
+    """
+
+    def __init__(self, left, top, column_widths, row_heights):
+        self.left = left
+        self.top = top
+        self.column_widths = list(column_widths)
+        self.row_heights = list(row_heights)
+        self.column_offsets = [0, *accumulate(self.column_widths)]
+        self.row_offsets = [0, *accumulate(self.row_heights)]
+
+    @classmethod
+    def from_table_shape(cls, table_shape):
+        table = table_shape.table
+        return cls(
+            table_shape.left,
+            table_shape.top,
+            [column.width for column in table.columns],
+            [row.height for row in table.rows],
+        )
+
+    def cell_box(self, row_idx, col_idx):
+        """
+        Returns (left, top, width, height) of a cell, in EMU, on the slide.
+        """
+
+        return (
+            self.left + self.column_offsets[col_idx],
+            self.top + self.row_offsets[row_idx],
+            self.column_widths[col_idx],
+            self.row_heights[row_idx],
+        )
+
+
+class TemplateTable:
+    """
+    Everything derived once from the table of a template slide.
+
+    Parameters
+    ----------
+    table_shape : pptx.shapes.graphfrm.GraphicFrame
+        The table shape found on the template slide.
+    """
+
+    def __init__(self, table_shape):
+        self.geometry = TableGeometry.from_table_shape(table_shape)
+        # Detached, pristine copy of the table's graphicFrame. New tables are
+        # stamped from it, never from the live template slide, so it cannot be
+        # affected by edits to the presentation.
+        self.snapshot = deepcopy(table_shape.element)
+        # Run written by each (row, column) of the table, see CompiledTableWriter
+        self.slots = compile_cell_slots(self.snapshot)
+
+    def new_table_element(self):
+        """Returns a fresh copy of the template table's graphicFrame element."""
+        return deepcopy(self.snapshot)
+
+
+def _find_table_shape(prs, source_slide_idx):
+    for shape in prs.slides[source_slide_idx].shapes:
+        if shape.has_table:
+            return shape
+    raise ValueError(f"No table found on slide {source_slide_idx} to copy")
+
+
+def get_template_table(prs, source_slide_idx):
+    """
+    Returns the cached TemplateTable for a template slide, building it on first use.
+
+    Entries are keyed on template file and slide index when the presentation
+    was registered with `register_template_file` (so the standard, wide, EN
+    and PT tables each get their own entry, shared across runs), otherwise
+    on the presentation itself.
+
+    Parameters
+    ----------
+    prs : pptx.Presentation
+        The loaded Presentation object that contains the template slides.
+
+    source_slide_idx : int
+        Index of the slide in prs.slides holding the template table.
+
+    Raises
+    ------
+    ValueError
+        If no table is found on the source slide.
+    """
+
+    template_file = _template_files.get(prs.part)
+    if template_file is not None:
+        tables = _tables_by_file
+        key = (template_file, source_slide_idx)
+    else:
+        tables = _tables_by_presentation.setdefault(prs.part, {})
+        key = source_slide_idx
+
+    if key not in tables:
+        tables[key] = TemplateTable(_find_table_shape(prs, source_slide_idx))
+    return tables[key]
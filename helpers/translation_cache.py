@@ -0,0 +1,117 @@
+import os
+import sqlite3
+import threading
+from path_helpers import get_cache_dir
+
+TRANSLATION_CACHE_FILE = "translations.sqlite3"
+SQLITE_MAX_PARAMS = 500  # stay well below SQLite's bound-parameter limit
+
+
+class TranslationCache:
+    """
+    Persistent SQLite store of translations keyed on source text and languages.
+
+    Successful translations are kept forever: the strings we translate
+    (countries, short investment descriptions) do not change meaning
+    between runs. Hit and miss counters cover the lifetime of the object.
+    The connection is shared between threads behind a lock, and WAL mode
+    lets several processes read and write the same file.
+
+    Parameters
+    ----------
+    path : str
+        SQLite database file, created if missing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    PRIMARY KEY (source_lang, target_lang, text)
+                )
+                """
+            )
+
+    def get(self, text, target_lang, source_lang="en"):
+        """Returns the cached translation of `text`, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE source_lang = ? AND target_lang = ? AND text = ?",
+                (source_lang, target_lang, text),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, text, translation, target_lang, source_lang="en"):
+        """Stores the translation of `text`, replacing any previous one."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (source_lang, target_lang, text, translation) VALUES (?, ?, ?, ?)",
+                (source_lang, target_lang, text, translation),
+            )
+
+    def get_many(self, texts, target_lang, source_lang="en"):
+        """
+        Looks up many texts at once.
+
+        Returns
+        -------
+        dict
+            Mapping of each cached text to its translation; misses are absent.
+        """
+
+        texts = list(texts)
+        found = {}
+        with self._lock:
+            for start in range(0, len(texts), SQLITE_MAX_PARAMS):
+                chunk = texts[start:start + SQLITE_MAX_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text, translation FROM translations WHERE source_lang = ? AND target_lang = ? AND text IN ({placeholders})",
+                    (source_lang, target_lang, *chunk),
+                ).fetchall()
+                found.update(rows)
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, translations, target_lang, source_lang="en"):
+        """Stores a mapping of text to translation in a single transaction."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (source_lang, target_lang, text, translation) VALUES (?, ?, ?, ?)",
+                [(source_lang, target_lang, text, translation) for text, translation in translations.items()],
+            )
+
+    def stats(self):
+        """Returns hit/miss counters and the number of stored translations."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_translation_cache():
+    """Returns the process-wide translation cache stored in the cache folder."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TranslationCache(os.path.join(get_cache_dir(), TRANSLATION_CACHE_FILE))
+    return _default_cache
@@ -7,4 +7,11 @@ def get_base_path():
     if getattr(sys, 'frozen', False):
          # When bundled by PyInstaller, resources live next to the executable
         return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.abspath(__file__))
\ No newline at end of file
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def get_cache_dir():
+    """Return the folder holding persistent run caches, creating it if needed."""
+    cache_dir = os.path.join(get_base_path(), ".cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
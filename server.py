@@ -0,0 +1,330 @@
+"""
+Local HTTP service generating buyers decks from a job queue.
+
+    python server.py [--port 8502] [--workers 2] [--max-queued 20]
+
+Endpoints (JSON unless stated):
+
+    POST /jobs?filename=buyers.xlsx&layout=2&language=pt[&template_file=...][&sheet=...][&force_logo_refresh=1]
+        Body: the raw buyers file (any format `load_buyers_file` reads).
+        Queues a job: 202 with the job, 400 on bad options, 413 if the file
+        is too large, 503 when the queue is full.
+    GET /jobs
+        Every job kept by the service.
+    GET /jobs/<id>
+        Status of a job: queued, running, done or failed.
+    GET /jobs/<id>/result
+        The finished .pptx (409 while the job is not done).
+
+For example:
+
+    curl --data-binary @buyers.xlsx "http://127.0.0.1:8502/jobs?filename=buyers.xlsx&layout=2"
+
+Jobs run on a fixed number of worker processes, so concurrent users cannot
+oversubscribe the CPU, and only one job at a time fetches logos and
+translations, through one Brandfetch key pool shared by every job
+(keys from the BRANDFETCH_API_KEY1..3 environment variables).
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from batch import BRANDFETCH_KEY_VARIABLES, BatchJob, generate_deck, load_job_input, resolve_resources
+from helpers.buyers_input import get_input_format
+from helpers.key_pool import BrandfetchKeyPool
+from helpers.template_registry import TEMPLATE_FILES
+from path_helpers import get_cache_dir
+
+DEFAULT_PORT = 8502
+DEFAULT_WORKERS = 2
+MAX_QUEUED_JOBS = 20
+MAX_UPLOAD_MB = 100
+JOB_TTL = 24 * 60 * 60  # seconds a finished job and its files are kept
+
+PPTX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+class GenerationJob:
+    """A deck requested through the service, and its progress."""
+
+    def __init__(self, job_id, batch_job, filename, force_logo_refresh=False):
+        self.id = job_id
+        self.batch_job = batch_job
+        self.filename = filename
+        self.force_logo_refresh = force_logo_refresh
+        self.status = "queued"
+        self.error = None
+        self.slides = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "template_number": self.batch_job.template_number,
+            "template_file": self.batch_job.template_file,
+            "status": self.status,
+            "error": self.error,
+            "slides": self.slides,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class GenerationService:
+    """
+    Queue of deck generation jobs, run by a bounded pool of worker processes.
+
+    One runner thread per worker takes jobs off the queue: the buyers file
+    is loaded in a worker process, its logos and translations are resolved
+    in this process (one job at a time, with the shared key pool) and the
+    deck is rendered in a worker process, streamed to the job's folder.
+
+    Parameters
+    ----------
+    brand_api_key : BrandfetchKeyPool
+        Shared by every job.
+
+    jobs_dir : str
+        Folder holding each job's upload and result.
+
+    workers : int
+        Number of jobs processed at a time.
+
+    max_queued : int
+        Number of jobs waiting before new ones are refused.
+
+    job_ttl : int
+        Seconds a finished job is kept before its files are deleted.
+    """
+
+    def __init__(self, brand_api_key, jobs_dir, workers=DEFAULT_WORKERS, max_queued=MAX_QUEUED_JOBS, job_ttl=JOB_TTL):
+        self.brand_api_key = brand_api_key
+        self.jobs_dir = jobs_dir
+        self.job_ttl = job_ttl
+        os.makedirs(jobs_dir, exist_ok=True)
+
+        self._jobs = {}
+        self._lock = threading.Lock()
+        # Logos and translations are fetched by one job at a time, so the
+        # Brandfetch quota is spent at the rate of a single user
+        self._resolve_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queued)
+        # Spawned rather than forked: the service handles requests on threads
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._runners = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for runner in self._runners:
+            runner.start()
+
+    def submit(self, file_bytes, filename, options):
+        """
+        Saves an upload and queues its job.
+
+        Parameters
+        ----------
+        file_bytes : bytes
+            The buyers file.
+
+        filename : str
+            Name of the uploaded file; its extension gives the input format.
+
+        options : dict
+            Optional `layout`, `language`, `template_file`, `sheet` and
+            `force_logo_refresh`, as in a batch manifest.
+
+        Returns
+        -------
+        GenerationJob
+
+        Raises
+        ------
+        ValueError
+            If the file format or an option is invalid.
+
+        queue.Full
+            If too many jobs are already waiting.
+        """
+
+        filename = os.path.basename(filename or "")
+        get_input_format(filename)
+        template_file = options.get("template_file", TEMPLATE_FILES["standard"])
+        if template_file not in TEMPLATE_FILES and template_file not in TEMPLATE_FILES.values():
+            raise ValueError(f"Unknown template file '{template_file}'")
+
+        self._purge_expired()
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        entry = {key: value for key, value in options.items() if key in ("layout", "language", "sheet")}
+        entry.update(input=os.path.join(job_dir, filename), output=os.path.join(job_dir, "buyers_presentation.pptx"),
+                     template_file=template_file)
+        job = GenerationJob(job_id, BatchJob(entry, job_dir), filename,
+                            force_logo_refresh=options.get("force_logo_refresh") in ("1", "true", True))
+
+        os.makedirs(job_dir)
+        with open(job.batch_job.input, "wb") as f:
+            f.write(file_bytes)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+        with self._lock:
+            self._jobs[job_id] = job
+        print(f"📨 Queued job {job_id} ({filename}, template {job.batch_job.template_number})")
+        return job
+
+    def get(self, job_id):
+        """Returns a job by id, or None."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        """Returns every job kept, oldest first."""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job):
+        batch_job = job.batch_job
+        job.status = "running"
+        job.started = time.time()
+        try:
+            df = self._executor.submit(load_job_input, batch_job.input, batch_job.sheet, batch_job.columns).result()
+            languages = [batch_job.language] if batch_job.language != "en" else []
+            with self._resolve_lock:
+                logo_files = resolve_resources(df, self.brand_api_key, languages, job.force_logo_refresh)
+            job.slides, _ = self._executor.submit(
+                generate_deck, batch_job, df, self.brand_api_key, job.force_logo_refresh, logo_files
+            ).result()
+            job.status = "done"
+            print(f"✅ Job {job.id}: {job.slides} slides")
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            print(f"❌ Job {job.id} failed: {e}")
+        finally:
+            job.finished = time.time()
+
+    def _purge_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.finished is not None and now - job.finished > self.job_ttl
+            ]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            shutil.rmtree(os.path.join(self.jobs_dir, job.id), ignore_errors=True)
+
+    def shutdown(self):
+        """Stops the runners once the jobs in progress finish, and the worker processes."""
+        for _ in self._runners:
+            self._queue.put(None)
+        for runner in self._runners:
+            runner.join()
+        self._executor.shutdown()
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front of a GenerationService (set as the `service` class attribute)."""
+
+    service = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/jobs":
+            return self._send_json(404, {"error": "Not found"})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_UPLOAD_MB * 1024 ** 2:
+            return self._send_json(413, {"error": f"Files are limited to {MAX_UPLOAD_MB} MB"})
+        file_bytes = self.rfile.read(length)
+        if not file_bytes:
+            return self._send_json(400, {"error": "Send the buyers file as the request body"})
+
+        options = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            job = self.service.submit(file_bytes, options.pop("filename", ""), options)
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+        except queue.Full:
+            return self._send_json(503, {"error": "Too many jobs queued, try again later"})
+        self._send_json(202, job.to_dict())
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/jobs":
+            return self._send_json(200, [job.to_dict() for job in self.service.list()])
+
+        match = re.fullmatch(r"/jobs/([0-9a-f]+)(/result)?", path)
+        job = self.service.get(match.group(1)) if match else None
+        if job is None:
+            return self._send_json(404, {"error": "Not found"})
+        if not match.group(2):
+            return self._send_json(200, job.to_dict())
+        if job.status != "done":
+            return self._send_json(409, {"error": f"Job is {job.status}"})
+
+        output_file = job.batch_job.output
+        self.send_response(200)
+        self.send_header("Content-Type", PPTX_CONTENT_TYPE)
+        self.send_header("Content-Length", str(os.path.getsize(output_file)))
+        self.send_header("Content-Disposition", f'attachment; filename="{os.path.basename(output_file)}"')
+        self.end_headers()
+        with open(output_file, "rb") as f:
+            shutil.copyfileobj(f, self.wfile)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve buyers deck generation over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="jobs processed at a time")
+    parser.add_argument("--max-queued", type=int, default=MAX_QUEUED_JOBS, help="jobs waiting before new ones are refused")
+    parser.add_argument("--jobs-dir", default=os.path.join(get_cache_dir(), "jobs"), help="folder of uploads and results")
+    args = parser.parse_args(argv)
+
+    brand_api_key = BrandfetchKeyPool({name: os.environ.get(name, "") for name in BRANDFETCH_KEY_VARIABLES})
+    service = GenerationService(brand_api_key, args.jobs_dir, workers=args.workers, max_queued=args.max_queued)
+    handler = type("Handler", (GenerationRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"🚀 Serving deck generation on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
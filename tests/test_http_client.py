@@ -0,0 +1,126 @@
+"""
+Retries, backoff and timeouts of the shared HTTP client, against a local
+stand-in for Brandfetch (`BRANDFETCH_API_URL` pointed at `http.server`).
+
+    python -m pytest tests
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from helpers import brandfetcher, http_client
+from helpers.key_pool import BrandfetchKeyPool
+
+LOGO_URL = "https://cdn.example.com/logo.png"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next scripted (status, headers, body, delay), repeating the last one."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            status, headers, body, delay = server.responses[min(len(server.requests), len(server.responses)) - 1]
+        time.sleep(delay)
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        try:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except OSError:  # the client timed out and went away
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    """Starts the stand-in server and points the Brandfetch client at it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.responses = [(200, {}, {}, 0)]
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(brandfetcher, "BRANDFETCH_API_URL", server.url)
+    # Keep the backoff short; Retry-After headers still set the waits they ask for
+    monkeypatch.setattr(http_client, "BACKOFF_BASE", 0.01)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_429_with_retry_after_is_retried(stand_in):
+    stand_in.responses = [
+        (429, {"Retry-After": "0.3"}, None, 0),
+        (200, {}, {"logos": [{"type": "logo", "theme": "dark", "formats": [{"format": "png", "src": LOGO_URL}]}]}, 0),
+    ]
+
+    start = time.perf_counter()
+    logo_url, definitive = brandfetcher.lookup_brandfetch_logo("example.com", BrandfetchKeyPool(["key"]))
+
+    assert (logo_url, definitive) == (LOGO_URL, True)
+    assert stand_in.requests == ["/brands/example.com"] * 2
+    assert time.perf_counter() - start >= 0.3
+
+
+def test_retry_after_is_honoured_by_get(stand_in):
+    stand_in.responses = [(429, {"Retry-After": "0.3"}, None, 0), (200, {}, {}, 0)]
+
+    start = time.perf_counter()
+    response = http_client.get(stand_in.url + "/brands/example.com")
+
+    assert response.status_code == 200
+    assert len(stand_in.requests) == 2
+    assert time.perf_counter() - start >= 0.3
+
+
+def test_503_is_retried_up_to_max_retries(stand_in):
+    stand_in.responses = [(503, {}, None, 0)]
+
+    response = http_client.get(stand_in.url + "/brands/example.com")
+
+    assert response.status_code == 503
+    assert len(stand_in.requests) == http_client.MAX_RETRIES + 1
+
+
+def test_slow_response_hits_read_timeout(stand_in, monkeypatch):
+    monkeypatch.setattr(http_client, "READ_TIMEOUT", 0.2)
+    stand_in.responses = [(200, {}, {}, 1.0)]
+
+    start = time.perf_counter()
+    response = http_client.get(stand_in.url + "/brands/example.com", max_retries=1)
+
+    assert response is None
+    assert len(stand_in.requests) == 2
+    assert time.perf_counter() - start < 2.0
+
+
+def test_cancel_event_ends_backoff(stand_in):
+    stand_in.responses = [(503, {"Retry-After": "10"}, None, 0)]
+    cancel_event = threading.Event()
+    threading.Timer(0.2, cancel_event.set).start()
+
+    start = time.perf_counter()
+    response = http_client.get(stand_in.url + "/brands/example.com", cancel_event=cancel_event)
+
+    assert response.status_code == 503
+    assert len(stand_in.requests) == 1
+    assert time.perf_counter() - start < 2.0
+
+
+@pytest.mark.parametrize("value, expected", [("120", 120.0), ("-5", 0.0), ("soon", None), (None, None)])
+def test_parse_retry_after(value, expected):
+    assert http_client.parse_retry_after(value) == expected
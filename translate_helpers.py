@@ -1,9 +1,42 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from deep_translator import GoogleTranslator
+from helpers.translation_cache import get_translation_cache
+from helpers.run_report import count, span
+
+# Text columns the Portuguese layouts translate
+TRANSLATED_COLUMNS = ["country", "investment1_shortdesc", "investment2_shortdesc", "investment3_shortdesc"]
+
+TRANSLATION_WORKERS = 8
+TRANSLATION_BATCH_SIZE = 20
+
+_translators = threading.local()
+
+
+def get_translator(target_lang: str = 'pt', source_lang: str = 'en') -> GoogleTranslator:
+    """
+    Returns a GoogleTranslator for the language pair, reused across calls.
+
+    Translators keep per-request state on the instance, so each thread gets
+    its own client instead of constructing a new one for every string.
+    """
+    cache = getattr(_translators, "by_pair", None)
+    if cache is None:
+        cache = _translators.by_pair = {}
+    pair = (source_lang, target_lang)
+    if pair not in cache:
+        cache[pair] = GoogleTranslator(source=source_lang, target=target_lang)
+    return cache[pair]
+
 
 def translate_text(text: str, target_lang: str = 'pt') -> str:
     """
     Translates text from English to the specified target language (default Portuguese).
-    
+
+    Translations are looked up in the persistent translation cache first, so
+    strings already translated in a previous run cost no network round trip.
+
     Parameters:
         text (str): The text to translate.
         target_lang (str): The target language code ('pt' for Portuguese, 'en' for English, etc.)
@@ -13,8 +46,117 @@ def translate_text(text: str, target_lang: str = 'pt') -> str:
     """
     if not text or not isinstance(text, str):
         return text
+    cache = get_translation_cache()
+    cached = cache.get(text, target_lang)
+    if cached is not None:
+        count("translation_cache_hits")
+        return cached
+    count("translation_calls")
     try:
-        return GoogleTranslator(source='en', target=target_lang).translate(text)
+        with span("translation"):
+            translated = get_translator(target_lang).translate(text)
     except Exception as e:
         print(f"Translation error: {e}")
-        return text
\ No newline at end of file
+        return text
+    # deep_translator returns None for text without letters or digits (e.g. '-')
+    if not isinstance(translated, str) or not translated:
+        return text
+    cache.put(text, translated, target_lang)
+    return translated
+
+
+def translate_batch(batch: list, target_lang: str = 'pt') -> dict:
+    """
+    Translates a batch of strings with this worker thread's translator.
+    Strings that fail to translate, or come back empty or as None, are
+    left out of the result.
+    """
+    translator = get_translator(target_lang)
+    results = {}
+    count("translation_calls", len(batch))
+    with span("translation"):
+        for text in batch:
+            try:
+                translated = translator.translate(text)
+            except Exception as e:
+                print(f"Translation error: {e}")
+                continue
+            if isinstance(translated, str) and translated:
+                results[text] = translated
+    return results
+
+
+def translate_many(texts, target_lang: str = 'pt', max_workers: int = TRANSLATION_WORKERS,
+                   batch_size: int = TRANSLATION_BATCH_SIZE) -> dict:
+    """
+    Translates many strings at once, each distinct string at most once.
+
+    Texts are deduplicated and looked up in the translation cache with a
+    single query; only the misses go to Google Translate, split into
+    batches handled by a bounded pool of workers, each reusing its own
+    translator client. Every successful batch is written back to the
+    cache in one transaction.
+
+    Parameters:
+        texts (iterable of str): Strings to translate; non-strings and empty strings are skipped.
+        target_lang (str): The target language code.
+        max_workers (int): Maximum number of concurrent translation workers.
+        batch_size (int): Number of strings handled per worker task.
+
+    Returns:
+        dict: Mapping of each distinct input string to its translation.
+    """
+    unique_texts = list(dict.fromkeys(text for text in texts if text and isinstance(text, str)))
+    cache = get_translation_cache()
+    table = cache.get_many(unique_texts, target_lang)
+    count("translation_cache_hits", len(table))
+    missing = [text for text in unique_texts if text not in table]
+    if not missing:
+        return table
+
+    print(f"🌐 Translating {len(missing)} new strings of {len(unique_texts)} distinct...")
+    batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Batches run in copies of this context, so they report to the current run report
+        contexts = [contextvars.copy_context() for _ in batches]
+        for results in executor.map(lambda context, batch: context.run(translate_batch, batch, target_lang), contexts, batches):
+            table.update(results)
+            cache.put_many(results, target_lang)
+
+    # Like translate_text, strings that failed to translate keep their source text
+    for text in missing:
+        table.setdefault(text, text)
+    return table
+
+
+def collect_translatable_texts(df) -> list:
+    """
+    Returns every string the Portuguese layouts will translate for `df`.
+
+    Values are converted with `str()` exactly like the renderers do.
+    """
+    texts = []
+    for column in TRANSLATED_COLUMNS:
+        if column in df.columns:
+            texts.extend(df[column].map(str))
+    return texts
+
+
+def build_translation_table(df, target_lang: str = 'pt') -> dict:
+    """
+    Translates every distinct translatable string of the buyers DataFrame up front.
+
+    Returns:
+        dict: Lookup table of source string to translation, for `lookup_translation`.
+    """
+    return translate_many(collect_translatable_texts(df), target_lang=target_lang)
+
+
+def lookup_translation(text: str, translations: dict = None, target_lang: str = 'pt') -> str:
+    """
+    Returns the translation of `text` from a prebuilt table, falling back
+    to `translate_text` for strings the table does not cover.
+    """
+    if translations is not None and text in translations:
+        return translations[text]
+    return translate_text(text, target_lang)